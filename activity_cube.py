@@ -0,0 +1,169 @@
+# activity_cube.py
+import numpy as np
+import pandas as pd
+
+# ====================================================
+# Pre-aggregated activity cube for dashboard filtering
+# ====================================================
+# One cell per observed date x user_segment x device_type x
+# user_acquisition_channel with additive measures (sessions and sums) and a
+# HyperLogLog sketch of the cell's users. Filters select cells, roll-ups sum
+# the measures and max-merge the sketches, so answering a filter costs
+# O(cells) no matter how many activity rows were aggregated. Cubes built
+# from separate chunks merge exactly the same way.
+DIMENSIONS = ["date", "user_segment", "device_type", "user_acquisition_channel"]
+MEASURES = {
+    "sessions": None,
+    "duration_sum": "session_duration",
+    "screens_sum": "screens_viewed",
+    "opens_sum": "app_opens",
+}
+HLL_PRECISION = 10  # 1,024 one-byte registers per cell, ~3% standard error
+
+
+# --------------- HyperLogLog ------------------
+def _hash_users(user_ids) -> np.ndarray:
+    """64-bit hash per row, hashing each distinct user_id once"""
+    values = pd.Categorical(user_ids)
+    hashes = pd.util.hash_array(values.categories.to_numpy().astype(str))
+    return hashes[values.codes]
+
+
+def _leading_zeros(w: np.ndarray) -> np.ndarray:
+    """Leading zero bits of uint64 values (64 for zero), exact"""
+    hi, lo = (w >> np.uint64(32)).astype(np.float64), (w & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide="ignore"):
+        clz_hi = 31 - np.floor(np.log2(hi))
+        clz_lo = 63 - np.floor(np.log2(lo))
+    return np.where(hi > 0, clz_hi, np.where(lo > 0, clz_lo, 64)).astype(np.uint8)
+
+
+def hll_registers(hashes, cell_index, n_cells, precision=HLL_PRECISION) -> np.ndarray:
+    """Per-cell HyperLogLog registers, shape (n_cells, 2**precision), uint8"""
+    m = 1 << precision
+    register = (hashes >> np.uint64(64 - precision)).astype(np.intp)
+    rank = np.minimum(_leading_zeros(hashes << np.uint64(precision)) + 1, 64 - precision + 1).astype(np.uint8)
+    registers = np.zeros(n_cells * m, dtype=np.uint8)
+    np.maximum.at(registers, cell_index * m + register, rank)
+    return registers.reshape(n_cells, m)
+
+
+def hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """Distinct-count estimate per row of registers (with small-range correction)"""
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int32)), axis=1)
+    zeros = np.count_nonzero(registers == 0, axis=1)
+    with np.errstate(divide="ignore"):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+def _max_by_group(sorted_registers, starts) -> np.ndarray:
+    """Register-wise max per contiguous group (np.maximum.reduceat on axis 0 is ~15x slower)"""
+    return np.stack([group.max(axis=0) for group in np.split(sorted_registers, starts[1:])])
+
+
+class ActivityCube:
+    """
+    Cells (DIMENSIONS + MEASURES columns, sorted by date) plus one HyperLogLog
+    register row per cell. filter() narrows the cells; rollup() aggregates them.
+    """
+
+    def __init__(self, cells: pd.DataFrame, registers: np.ndarray):
+        self.cells = cells
+        self.registers = registers
+
+    def __len__(self):
+        return len(self.cells)
+
+    # --------------- Building ------------------
+    @classmethod
+    def from_frame(cls, raw_df: pd.DataFrame, precision=HLL_PRECISION) -> "ActivityCube":
+        """Aggregate raw activity rows (mobile_analytics schema) into a cube"""
+        columns = [column for column in MEASURES.values() if column is not None]
+        rows = raw_df[DIMENSIONS].assign(
+            date=pd.to_datetime(raw_df["date"]).dt.normalize(),
+            **{column: raw_df[column].astype("float64") for column in columns},  # float32 sums drift
+        )
+        grouped = rows.groupby(DIMENSIONS, observed=True, sort=True)
+        cells = pd.DataFrame({
+            measure: grouped.size() if column is None else grouped[column].sum()
+            for measure, column in MEASURES.items()
+        }).reset_index()
+        # Rows with a missing dimension (NaN/NaT) fall in no group, as in size()/sum();
+        # rows without a user_id count as sessions but not as users
+        cell_index = grouped.ngroup().to_numpy()
+        keep = ~np.isnan(cell_index) & raw_df["user_id"].notna().to_numpy()
+        registers = hll_registers(
+            _hash_users(raw_df["user_id"][keep]), cell_index[keep].astype(np.intp), len(cells), precision
+        )
+        return cls(cells, registers)
+
+    @classmethod
+    def from_chunks(cls, chunks, precision=HLL_PRECISION) -> "ActivityCube":
+        """Build out of core, e.g. from analytics_schema.iter_mobile_analytics(path)"""
+        cube = None
+        for chunk in chunks:
+            part = cls.from_frame(chunk, precision)
+            cube = part if cube is None else cube.merge(part)
+        return cube
+
+    def merge(self, other: "ActivityCube") -> "ActivityCube":
+        """Combine cubes over disjoint or overlapping rows: sum measures, max registers"""
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        for col in DIMENSIONS[1:]:
+            cells[col] = cells[col].astype(str)
+        groups = cells.groupby(DIMENSIONS, sort=True).ngroup().to_numpy()
+        merged = cells.groupby(DIMENSIONS, sort=True)[list(MEASURES)].sum().reset_index()
+        order = np.argsort(groups, kind="stable")
+        starts = np.searchsorted(groups[order], np.arange(len(merged)))
+        registers = _max_by_group(np.concatenate([self.registers, other.registers])[order], starts)
+        for col in DIMENSIONS[1:]:
+            merged[col] = merged[col].astype("category")
+        return ActivityCube(merged, registers)
+
+    # --------------- Querying ------------------
+    def filter(self, start=None, end=None, **dimensions) -> "ActivityCube":
+        """
+        Cells within [start, end] whose dimension values are in the given
+        lists, e.g. filter(user_segment=["power_users"], device_type=["iOS"]).
+        None or an empty list leaves a dimension unfiltered.
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        if start is not None:
+            mask &= (self.cells["date"] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (self.cells["date"] <= pd.Timestamp(end)).to_numpy()
+        for col, values in dimensions.items():
+            if col not in DIMENSIONS:
+                raise ValueError(f"unknown cube dimension: {col}")
+            if values:
+                mask &= self.cells[col].isin(values).to_numpy()
+        return ActivityCube(self.cells[mask].reset_index(drop=True), self.registers[mask])
+
+    def rollup(self, by=None) -> pd.DataFrame:
+        """
+        Measures summed per `by` dimension (or overall when None) with
+        estimated distinct active_users and average session metrics.
+        """
+        if by is None:
+            codes, labels = np.zeros(len(self.cells), dtype=np.intp), np.array(["all"])
+        else:
+            codes, labels = pd.factorize(self.cells[by], sort=True)
+        n_groups = len(labels) if len(self.cells) else 0
+
+        out = {by or "all": labels[:n_groups]}
+        for measure in MEASURES:
+            out[measure] = np.bincount(codes, weights=self.cells[measure].to_numpy(), minlength=n_groups)
+        order = np.argsort(codes, kind="stable")
+        starts = np.searchsorted(codes[order], np.arange(n_groups))
+        merged = _max_by_group(self.registers[order], starts) if n_groups else None
+        out["active_users"] = np.round(hll_estimate(merged)).astype(np.int64) if n_groups else np.zeros(0, np.int64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sessions = np.where(out["sessions"] > 0, out["sessions"], np.nan)
+            out["avg_session_duration"] = out["duration_sum"] / sessions
+            out["avg_screens_per_session"] = out["screens_sum"] / sessions
+        return pd.DataFrame(out)
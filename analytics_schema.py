@@ -0,0 +1,79 @@
+# analytics_schema.py
+import pandas as pd
+
+# ====================================================
+# Compact dtype schema for mobile_analytics frames
+# ====================================================
+# Category levels are kept sorted so get_dummies(drop_first=True) drops the
+# same baseline level the churn model was trained with.
+CATEGORY_LEVELS = {
+    "device_type": ["Android", "iOS"],
+    "user_acquisition_channel": [
+        "app_store", "direct", "email", "organic",
+        "paid_search", "paid_social", "referral", "unknown",
+    ],
+    "user_segment": ["casual_users", "churned_users", "power_users", "regular_users"],
+}
+
+FLOAT_COLUMNS = ["session_duration", "retention_rate"]
+INTEGER_DTYPES = {"screens_viewed": "int32", "app_opens": "int16", "daily_active_users": "int32"}
+DATE_COLUMNS = ["date"]
+
+# Dtypes read_csv can apply while parsing; integer counts are cast afterwards
+CSV_DTYPES = {
+    "user_id": "category",
+    **{col: "category" for col in CATEGORY_LEVELS},
+    **{col: "float32" for col in FLOAT_COLUMNS},
+}
+
+
+def _as_category(values, levels):
+    """Categorical over the declared levels plus any unseen values, kept sorted"""
+    observed = pd.unique(values.dropna().astype(str))
+    categories = sorted(set(levels).union(observed))
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.set_categories(categories)
+    return values.astype(pd.CategoricalDtype(categories))
+
+
+def compact_mobile_analytics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast a mobile_analytics frame to the compact schema:
+    categorical ids and dimensions, datetime64 dates, float32 measures
+    and narrow integer counts (float32 if a count column has gaps).
+    """
+    df = df.copy(deep=False)
+
+    if "user_id" in df.columns:
+        df["user_id"] = df["user_id"].astype("category")
+    for col, levels in CATEGORY_LEVELS.items():
+        if col in df.columns:
+            df[col] = _as_category(df[col], levels)
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    for col, dtype in INTEGER_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype("float32" if df[col].isna().any() else dtype)
+
+    return df
+
+
+def iter_mobile_analytics(path, chunksize=500_000):
+    """
+    Yield mobile_analytics rows in compact-schema chunks of at most `chunksize`
+    rows from a CSV file, a Parquet file or a directory of Parquet partitions.
+    """
+    if str(path).endswith(".csv"):
+        reader = pd.read_csv(path, dtype=CSV_DTYPES, parse_dates=DATE_COLUMNS, chunksize=chunksize)
+        for chunk in reader:
+            yield compact_mobile_analytics(chunk)
+        return
+
+    import pyarrow.dataset as ds
+
+    for batch in ds.dataset(path, format="parquet").to_batches(batch_size=chunksize):
+        yield compact_mobile_analytics(batch.to_pandas())
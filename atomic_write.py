@@ -0,0 +1,39 @@
+# atomic_write.py
+import os
+import tempfile
+from contextlib import contextmanager
+
+# ====================================================
+# Atomic file replacement
+# ====================================================
+# Files other processes read while they are rewritten (dataset sidecars, the
+# store's GENERATION counter, cached figures, the feature encoder) are written
+# to a temp file in the same directory and renamed over the target, so a
+# reader opens either the old file or the complete new one, never a partial
+# one. A failed write leaves the old file and no temp file behind.
+
+
+@contextmanager
+def atomic_path(path, suffix=".tmp"):
+    """
+    Temp file path next to `path` to write into; it replaces `path` when the
+    block exits cleanly and is removed when it raises.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=suffix)
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_atomic(path, text):
+    """Replace `path` with `text` atomically"""
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "w") as f:
+            f.write(text)
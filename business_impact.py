@@ -1,11 +1,11 @@
 # business_impact_calculator.py
-import pandas as pd
+from datasets import read_dataset
 
 print("💰 CALCULATING BUSINESS IMPACT PROJECTIONS\n")
 
 # Load your data
-mobile_df = pd.read_csv("data/mobile_analytics.csv")
-ret_df = pd.read_csv("data/advanced_retention.csv")
+mobile_df = read_dataset("mobile_analytics")
+ret_df = read_dataset("advanced_retention")
 
 # ========== ASSUMPTIONS (ADJUST THESE) ==========
 AVERAGE_REVENUE_PER_USER_MONTHLY = 10  # $ per user per month
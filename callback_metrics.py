@@ -0,0 +1,204 @@
+# callback_metrics.py
+import os
+import time
+import threading
+import tracemalloc
+from collections import deque
+from functools import wraps
+
+import numpy as np
+from dash.exceptions import PreventUpdate
+
+# ====================================================
+# Per-callback instrumentation and Prometheus /metrics
+# ====================================================
+# @metrics.track wraps a Dash callback and records, per invocation, wall time,
+# CPU time of the serving thread, peak memory allocated while it ran and the
+# size of the serialized response Dash sends back (taken from the Flask
+# response itself, so nothing is serialized twice). Each measure feeds a
+# cumulative Prometheus histogram plus a rolling window of recent samples
+# exported as p50/p90/p99. Metrics are per process: with several server
+# workers, each one reports its own invocations.
+#
+# Peak memory uses tracemalloc, which slows allocation-heavy callbacks 2-3x,
+# so it is sampled: every MEMORY_SAMPLE_EVERY-th invocation of a callback
+# (starting with its second, the first is often a cold build) is traced, and
+# those runs feed only the memory histogram, not the timings. With
+# CALLBACK_MEMORY_SAMPLE_EVERY=1 every call is traced and timings are kept
+# (inflated by tracemalloc). tracemalloc tracks the whole process, so one
+# callback at a time is traced.
+SLOW_CALLBACK_MS = float(os.environ.get("SLOW_CALLBACK_MS", 500))
+MEMORY_SAMPLE_EVERY = int(os.environ.get("CALLBACK_MEMORY_SAMPLE_EVERY", 10))  # 0 disables
+RECENT_WINDOW = int(os.environ.get("CALLBACK_METRICS_WINDOW", 1000))
+RECENT_QUANTILES = (0.5, 0.9, 0.99)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = tuple(1024 * 4 ** i for i in range(9))  # 1 KiB .. 64 MiB
+
+# name -> (help, buckets)
+MEASURES = {
+    "wall_seconds": ("Wall-clock time spent in the callback", SECONDS_BUCKETS),
+    "cpu_seconds": ("CPU time of the thread running the callback", SECONDS_BUCKETS),
+    "peak_memory_bytes": ("Peak memory allocated while the callback ran (sampled, tracemalloc)", BYTES_BUCKETS),
+    "response_bytes": ("Size of the serialized callback response", BYTES_BUCKETS),
+}
+
+
+class RollingHistogram:
+    """Cumulative bucket counts for Prometheus plus a window of recent samples"""
+
+    def __init__(self, buckets, window=RECENT_WINDOW):
+        self.buckets = np.asarray(buckets, dtype=np.float64)
+        self.counts = np.zeros(len(buckets) + 1, dtype=np.int64)  # last one is +Inf
+        self.total = 0.0
+        self._recent = deque(maxlen=window)
+
+    def observe(self, value):
+        self.counts[np.searchsorted(self.buckets, value, side="left")] += 1
+        self.total += value
+        self._recent.append(value)
+
+    def recent_quantiles(self, quantiles=RECENT_QUANTILES):
+        if not self._recent:
+            return {}
+        return dict(zip(quantiles, np.quantile(np.fromiter(self._recent, dtype=np.float64), quantiles)))
+
+
+class CallbackMetrics:
+    def __init__(self, slow_ms=SLOW_CALLBACK_MS, memory_sample_every=MEMORY_SAMPLE_EVERY):
+        self.slow_ms = slow_ms
+        self.memory_sample_every = memory_sample_every
+        self._invocations = {}  # callback -> count, for memory sampling
+        self._histograms = {}   # (callback, measure) -> RollingHistogram
+        self._counters = {}     # (callback, counter) -> int
+        self._lock = threading.Lock()
+        self._memory_lock = threading.Lock()
+
+    # --------------- Recording ------------------
+    def observe(self, callback, measure, value):
+        with self._lock:
+            histogram = self._histograms.get((callback, measure))
+            if histogram is None:
+                histogram = self._histograms[(callback, measure)] = RollingHistogram(MEASURES[measure][1])
+            histogram.observe(value)
+
+    def increment(self, callback, counter):
+        with self._lock:
+            self._counters[(callback, counter)] = self._counters.get((callback, counter), 0) + 1
+
+    def _start_memory(self, callback):
+        with self._lock:
+            n = self._invocations.get(callback, 0)
+            self._invocations[callback] = n + 1
+        if not self.memory_sample_every or n % self.memory_sample_every != 1 % self.memory_sample_every:
+            return False
+        # Only one traced callback at a time, and never someone else's trace
+        if tracemalloc.is_tracing() or not self._memory_lock.acquire(blocking=False):
+            return False
+        tracemalloc.start()
+        return True
+
+    def _stop_memory(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self._memory_lock.release()
+        return peak
+
+    def track(self, func):
+        """Decorator for Dash callbacks (apply below @app.callback)"""
+        name = func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            _mark_request(name)
+            tracing = self._start_memory(name)
+            wall0, cpu0 = time.perf_counter(), time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            except PreventUpdate:
+                raise
+            except Exception:
+                self.increment(name, "errors")
+                raise
+            finally:
+                wall, cpu = time.perf_counter() - wall0, time.thread_time() - cpu0
+                if tracing:
+                    self.observe(name, "peak_memory_bytes", self._stop_memory())
+                # timings of traced runs are inflated by tracemalloc itself; skip
+                # them unless every run is traced
+                if not tracing or self.memory_sample_every == 1:
+                    self.observe(name, "wall_seconds", wall)
+                    self.observe(name, "cpu_seconds", cpu)
+                    if wall * 1000 >= self.slow_ms:
+                        self.increment(name, "slow")
+                        print(f" Slow callback {name}: {wall * 1000:.0f} ms wall, {cpu * 1000:.0f} ms CPU")
+
+        return wrapper
+
+    # --------------- Export ------------------
+    def to_prometheus(self, prefix="dash_callback") -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            snapshot = {
+                key: (histogram.buckets, histogram.counts.copy(), histogram.total, histogram.recent_quantiles())
+                for key, histogram in self._histograms.items()
+            }
+            counters = dict(self._counters)
+
+        lines = []
+        for measure, (help_text, _) in MEASURES.items():
+            series = sorted((callback, data) for (callback, m), data in snapshot.items() if m == measure)
+            if not series:
+                continue
+            metric = f"{prefix}_{measure}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for callback, (buckets, counts, total, _) in series:
+                cumulative = np.cumsum(counts)
+                for bound, count in zip([*map(_format_value, buckets), "+Inf"], cumulative):
+                    lines.append(f'{metric}_bucket{{callback="{callback}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_sum{{callback="{callback}"}} {_format_value(total)}')
+                lines.append(f'{metric}_count{{callback="{callback}"}} {cumulative[-1]}')
+
+            recent = f"{metric}_recent"
+            lines += [f"# HELP {recent} {help_text}, last {RECENT_WINDOW} invocations", f"# TYPE {recent} gauge"]
+            for callback, (*_, quantiles) in series:
+                for q, value in quantiles.items():
+                    lines.append(f'{recent}{{callback="{callback}",quantile="{q}"}} {_format_value(value)}')
+
+        for counter, help_text in (("errors", "Callback invocations that raised"),
+                                   ("slow", f"Callback invocations slower than {self.slow_ms:g} ms")):
+            metric = f"{prefix}_{counter}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for (callback, c), value in sorted(counters.items()):
+                if c == counter:
+                    lines.append(f'{metric}{{callback="{callback}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value):
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _mark_request(name):
+    """Tag the current Flask request so its response size is attributed to `name`"""
+    from flask import g, has_request_context
+    if has_request_context():
+        g.dash_callback = name
+
+
+def register_metrics_route(server, metrics, path="/metrics"):
+    """Record callback response sizes and expose `metrics` at GET {path}"""
+    from flask import Response, g
+
+    @server.after_request
+    def record_response_size(response):
+        name = g.pop("dash_callback", None)
+        if name is not None and not response.direct_passthrough:
+            metrics.observe(name, "response_bytes", response.calculate_content_length() or len(response.get_data()))
+        return response
+
+    @server.route(path, methods=["GET"])
+    def callback_metrics():
+        return Response(metrics.to_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    return server
@@ -0,0 +1,77 @@
+# chart_aggregates.py
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# ====================================================
+# Server-side summaries for distribution charts
+# ====================================================
+# Histograms and box plots are computed exactly over the full frame and the
+# figures are drawn from the summaries, so the browser receives a few bins
+# and five numbers per box instead of every underlying row.
+HISTOGRAM_BINS = 30
+MAX_OUTLIERS = 50  # per box, the most extreme ones on either side
+
+
+def histogram_bins(values, bins=HISTOGRAM_BINS) -> dict:
+    """Exact equal-width histogram over all non-missing values"""
+    values = pd.Series(values).dropna().to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(values, bins=bins)
+    return {"counts": counts, "edges": edges}
+
+
+def box_stats(df: pd.DataFrame, by, value, max_outliers=MAX_OUTLIERS) -> pd.DataFrame:
+    """
+    Box-plot statistics of `value` per `by` group, matching plotly's defaults:
+    linear quartiles, whiskers at the furthest points within 1.5 IQR of the
+    box. Outliers beyond the whiskers are capped at `max_outliers` per group
+    (the most extreme), with the full count in n_outliers.
+    """
+    rows = []
+    for key, values in df.groupby(by, observed=True, sort=True)[value]:
+        v = np.sort(values.dropna().to_numpy(dtype=np.float64))
+        if not len(v):
+            continue
+        q1, median, q3 = np.percentile(v, [25, 50, 75])
+        low_limit, high_limit = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        lo, hi = np.searchsorted(v, low_limit, side="left"), np.searchsorted(v, high_limit, side="right")
+
+        half = max_outliers // 2
+        low_out, high_out = v[:lo], v[hi:]
+        rows.append({
+            by: str(key),
+            "n": len(v),
+            "mean": v.mean(),
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "lowerfence": v[lo],
+            "upperfence": v[hi - 1],
+            "n_outliers": len(low_out) + len(high_out),
+            "outliers": np.concatenate([low_out[:half], high_out[len(high_out) - half:]]),
+        })
+    return pd.DataFrame(rows)
+
+
+# --------------- Figures ------------------
+def histogram_figure(hist, title, x_title) -> go.Figure:
+    edges = hist["edges"]
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=hist["counts"], width=np.diff(edges),
+                           hovertemplate="%{x:.2f}: %{y:,}<extra></extra>"))
+    return fig.update_layout(title=title, xaxis_title=x_title, yaxis_title="count", bargap=0)
+
+
+def box_figure(stats: pd.DataFrame, by, title, y_title) -> go.Figure:
+    fig = go.Figure(go.Box(
+        x=stats[by], q1=stats["q1"], median=stats["median"], q3=stats["q3"],
+        lowerfence=stats["lowerfence"], upperfence=stats["upperfence"], mean=stats["mean"],
+        name=y_title, boxpoints=False,
+    ))
+    outliers = stats[stats["outliers"].map(len) > 0]
+    if len(outliers):
+        fig.add_trace(go.Scatter(
+            x=np.repeat(outliers[by].to_numpy(), outliers["outliers"].map(len)),
+            y=np.concatenate(outliers["outliers"].to_list()),
+            mode="markers", marker=dict(size=4, opacity=0.6), name="outliers (most extreme)",
+        ))
+    return fig.update_layout(title=title, xaxis_title=by, yaxis_title=y_title, showlegend=False)
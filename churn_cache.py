@@ -0,0 +1,137 @@
+# churn_cache.py
+import json
+import sqlite3
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import numpy as np
+import pandas as pd
+
+from churn_model import aggregate_user_features, score_aggregates
+
+# ====================================================
+# Precomputed churn results for the dashboard
+# ====================================================
+# Scoring every user takes seconds, so it runs once per data version on a
+# background thread and the churn section only renders the stored aggregates.
+# With a shared figure_cache.FigureCache, one worker on the host scores each
+# version and the others read its summary from there.
+PROBABILITY_BINS = 30
+SUMMARY_KEY = "churn-summary"
+
+
+def summarize_churn(raw_df: pd.DataFrame, bins=PROBABILITY_BINS, store=None) -> dict:
+    """
+    Score every user once and keep only what the churn section draws:
+    headline numbers, a churn probability histogram and churn rate per segment.
+    The same scores replace the contents of `store` (a risk_store.RiskScoreStore).
+    """
+    predictions = score_aggregates(aggregate_user_features(raw_df))
+    if store is not None:
+        try:
+            store.replace(predictions)
+        except sqlite3.Error as e:
+            # read-only or locked store: the summary is still served
+            print(f" Could not update the risk store: {e}")
+
+    counts, edges = np.histogram(predictions["churn_probability"], bins=bins, range=(0.0, 1.0))
+    segment_rates = (
+        predictions.groupby("user_segment", observed=True)["churn_prediction"].mean().reset_index()
+    )
+    return {
+        "users": len(predictions),
+        "avg_churn_prob": predictions["churn_probability"].mean(),
+        "predicted_churners": int(predictions["churn_prediction"].sum()),
+        "high_risk_count": int(predictions["high_risk"].sum()),
+        "probability_counts": counts,
+        "probability_edges": edges,
+        "segment_rates": segment_rates,
+    }
+
+
+def summary_to_json(summary: dict) -> str:
+    return json.dumps({
+        **summary,
+        "avg_churn_prob": float(summary["avg_churn_prob"]),
+        "probability_counts": summary["probability_counts"].tolist(),
+        "probability_edges": summary["probability_edges"].tolist(),
+        "segment_rates": summary["segment_rates"].to_dict("list"),
+    })
+
+
+def summary_from_json(value: dict) -> dict:
+    return {
+        **value,
+        "probability_counts": np.asarray(value["probability_counts"]),
+        "probability_edges": np.asarray(value["probability_edges"]),
+        "segment_rates": pd.DataFrame(value["segment_rates"]),
+    }
+
+
+class ChurnResultCache:
+    """
+    Churn summaries keyed by data version. refresh() starts computing a
+    version in the background; get() returns it, waiting for an in-flight
+    computation rather than starting a second one. Only the latest version
+    and the last completed summary are kept; latest() falls back to the
+    latter while a new version is scored. `shared` (a
+    figure_cache.FigureCache) computes each version once per host.
+    """
+
+    def __init__(self, compute=summarize_churn, shared=None):
+        self.compute = compute
+        self.shared = shared
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="churn-cache")
+        self._lock = threading.Lock()
+        self._version = None
+        self._future = None
+        self._completed = None  # (version, summary) of the last successful computation
+
+    def refresh(self, version, raw_df):
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._future = self._executor.submit(self._compute, version, raw_df)
+                self._future.add_done_callback(partial(self._on_done, version))
+            return self._future
+
+    def _on_done(self, version, future):
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self._completed = (version, future.result())
+
+    def _compute(self, version, raw_df):
+        if self.shared is None:
+            return self.compute(raw_df)
+        return summary_from_json(self.shared.get_or_build_json(
+            SUMMARY_KEY, version, lambda: summary_to_json(self.compute(raw_df))
+        ))
+
+    def get(self, version, timeout=None) -> dict:
+        with self._lock:
+            if version != self._version:
+                raise KeyError(f"no churn results for data version {version!r}")
+            future = self._future
+        return future.result(timeout=timeout)
+
+    def latest(self, version, timeout=None):
+        """
+        (version, summary) to render for `version`: its own summary if it is
+        ready within `timeout` seconds, otherwise the last completed one, or
+        (None, None) before any computation finished. Errors of the
+        computation for `version` are raised.
+        """
+        with self._lock:
+            future = self._future if version == self._version else None
+            completed = self._completed
+        if future is not None:
+            try:
+                return version, future.result(timeout=timeout)
+            except TimeoutError:
+                pass
+        return completed or (None, None)
+
+    def ready(self, version) -> bool:
+        with self._lock:
+            return version == self._version and self._future.done()
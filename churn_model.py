@@ -3,94 +3,337 @@
 # ================================================
 import pandas as pd
 import numpy as np
-import joblib
 import os
+import threading
+from analytics_schema import iter_mobile_analytics
 
 # ====================================================
-# 1️⃣  Loading trained churn model
+# 1️⃣  Loading trained churn model (lazily, on first use)
 # ====================================================
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "data", "Deliverable", "churn_prediction_model.pkl")
-model = joblib.load(MODEL_PATH)
+COMPILED_FOREST_PATH = os.path.join(os.path.dirname(__file__), "data", "Deliverable", "churn_forest")
+FEATURE_ENCODER_PATH = os.path.join(os.path.dirname(__file__), "data", "Deliverable", "feature_encoder.json")
+
+
+def _load_pickled_model(path):
+    import joblib
+    return joblib.load(path)
+
+
+def file_sha256(path):
+    import hashlib
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_compiled_forest(path):
+    """
+    Memory-map the flattened forest. When the artifact is missing or was built
+    from a different pickle, compile it in memory for this process only;
+    serving processes never rewrite artifacts others may have mapped
+    (`python compiled_forest.py` regenerates it).
+    """
+    from compiled_forest import CompiledForest
+
+    source_sha256 = file_sha256(MODEL_PATH)
+    try:
+        forest = CompiledForest.load(path, mmap_mode="r")
+        if forest.source_sha256 == source_sha256:
+            return forest
+    except FileNotFoundError:
+        pass  # missing, or mid-swap while `python compiled_forest.py` regenerates it
+
+    print(f" Compiled forest at '{path}' is missing or stale; compiling in memory "
+          "(run `python compiled_forest.py` to regenerate it)")
+    return CompiledForest.from_sklearn(get_model(), source_sha256)
+
+
+def _load_feature_encoder(path):
+    """
+    Load the fitted feature encoder. When the file is missing or belongs to
+    a different pickle, refit it in memory for this process only
+    (`python feature_encoder.py` regenerates the file).
+    """
+    from feature_encoder import FeatureEncoder
+
+    source_sha256 = file_sha256(MODEL_PATH)
+    if os.path.exists(path):
+        encoder = FeatureEncoder.load(path)
+        if encoder.source_sha256 == source_sha256:
+            return encoder
+
+    print(f" Feature encoder at '{path}' is missing or stale; fitting in memory "
+          "(run `python feature_encoder.py` to regenerate it)")
+    return FeatureEncoder.fit(get_model().feature_names_in_, source_sha256=source_sha256)
+
+
+class LazyModel:
+    """
+    Handle that loads a model on first use.
+    Importing this module stays cheap (joblib/sklearn are only imported
+    when a prediction is actually requested) and concurrent first calls
+    from Dash worker threads load the model exactly once.
+    """
+
+    def __init__(self, path, loader=_load_pickled_model):
+        self.path = path
+        self.loader = loader
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self.loader(self.path)
+        return self._model
+
+
+model_handle = LazyModel(MODEL_PATH)
+compiled_forest_handle = LazyModel(COMPILED_FOREST_PATH, loader=_load_compiled_forest)
+feature_encoder_handle = LazyModel(FEATURE_ENCODER_PATH, loader=_load_feature_encoder)
+
+
+def get_model():
+    """Return the churn model, loading it on first call"""
+    return model_handle.get()
+
+
+def get_compiled_forest():
+    """Return the memory-mapped flattened forest (compiled_forest.CompiledForest)"""
+    return compiled_forest_handle.get()
+
+
+def get_feature_encoder():
+    """Return the fitted feature_encoder.FeatureEncoder for the model's columns"""
+    return feature_encoder_handle.get()
+
+
+def __getattr__(name):
+    # Keeps `churn_model.model` working without loading at import time
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ====================================================
 # 2️⃣  Preprocessing function — same logic as in training
 # ====================================================
-def preprocess_new_data(raw_df: pd.DataFrame) -> pd.DataFrame:
+# Per-user aggregations behind every model feature
+FEATURE_AGGREGATIONS = {
+    "session_duration": ["mean", "std", "min", "max", "sum"],
+    "screens_viewed": ["mean", "std", "max", "sum"],
+    "app_opens": ["mean", "std", "max", "sum"],
+    "retention_rate": ["mean", "min", "max", "std"],
+    "daily_active_users": ["mean", "std"],
+    "date": "count",
+    "device_type": "last",
+    "user_acquisition_channel": "last",
+    "user_segment": "last",
+}
+NUMERIC_FEATURE_COLUMNS = [col for col, aggs in FEATURE_AGGREGATIONS.items() if isinstance(aggs, list)]
+CATEGORICAL_FEATURE_COLUMNS = ["device_type", "user_acquisition_channel", "user_segment"]
+
+
+def aggregate_user_features(raw_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Reproduce the same feature engineering as during training.
-    Input: raw user-level data
-    Returns: processed DataFrame ready for model.predict()
+    Group raw activity rows into one row of aggregates per user
+    (user_id, <column>_<agg>..., total_active_days, <dimension>_last).
     """
 
     # --------------- Convert to datetime ----------------
     raw_df = raw_df.copy()  # Don't modify original
     raw_df["date"] = pd.to_datetime(raw_df["date"], errors="coerce")
+    raw_df[NUMERIC_FEATURE_COLUMNS] = raw_df[NUMERIC_FEATURE_COLUMNS].astype("float64")
 
     # --------------- Group & aggregate ------------------
-    agg_df = (
-        raw_df.groupby("user_id")
-        .agg(
-            {
-                "session_duration": ["mean", "std", "min", "max", "sum"],
-                "screens_viewed": ["mean", "std", "max", "sum"],
-                "app_opens": ["mean", "std", "max", "sum"],
-                "retention_rate": ["mean", "min", "max", "std"],
-                "daily_active_users": ["mean", "std"],
-                "date": "count",
-                "device_type": "last",
-                "user_acquisition_channel": "last",
-                "user_segment": "last",
-            }
-        )
-    )
+    agg_df = raw_df.groupby("user_id", observed=True).agg(FEATURE_AGGREGATIONS)
 
     # flatten the multi-level column names
     agg_df.columns = [
         "_".join(col) if isinstance(col, tuple) else col for col in agg_df.columns
     ]
-    agg_df = agg_df.rename(columns={"date_count": "total_active_days"}).reset_index()
-
-    # --------------- One-hot encoding (same as training) ------------------
-    cat_cols = ["device_type_last", "user_acquisition_channel_last", "user_segment_last"]
-    agg_df = pd.get_dummies(agg_df, columns=cat_cols, drop_first=True)
-
-    # --------------- Align with model's feature order ---------------------
-    expected_features = model.feature_names_in_  # works for sklearn >=1.0
-    for col in expected_features:
-        if col not in agg_df.columns:
-            agg_df[col] = 0  # add missing cols as 0
-    
-    # Keeping user_id before selecting features
-    user_ids = agg_df['user_id'].copy()
-    feature_df = agg_df[expected_features]
-    
-    return feature_df, user_ids
+    return agg_df.rename(columns={"date_count": "total_active_days"}).reset_index()
+
+
+def encode_features(agg_df: pd.DataFrame):
+    """
+    Encode per-user aggregates with the fitted feature encoder.
+    Returns: (float32 feature matrix in model column order, user_ids)
+    """
+    return get_feature_encoder().transform(agg_df), agg_df["user_id"]
+
+
+def preprocess_new_data(raw_df: pd.DataFrame):
+    """
+    Reproduce the same feature engineering as during training.
+    Input: raw user-level data
+    Returns: (feature matrix ready for the churn forest, user_ids)
+    """
+    return encode_features(aggregate_user_features(raw_df))
 
 # ====================================================
-# 3️⃣  Prediction helper
+# 3️⃣  Prediction helpers
 # ====================================================
-def predict_churn(raw_df: pd.DataFrame) -> pd.DataFrame:
+# Risk buckets used for data/Deliverable/all_user_risk_scores.csv
+RISK_BINS = [0.3, 0.6]
+RISK_LABELS = ["Low Risk", "Medium Risk", "High Risk"]
+# Dashboard's high-risk cut
+HIGH_RISK_THRESHOLD = 0.7
+# Columns of every scoring result (score_features and the functions built on it)
+SCORE_COLUMNS = ["user_id", "churn_probability", "churn_prediction", "risk_level", "high_risk"]
+
+
+def risk_levels(probs) -> pd.Categorical:
     """
-    Accept raw user-level data, preprocess, and return predictions + probabilities
+    Bucket churn probabilities into Low (<= 0.3), Medium (<= 0.6) and High Risk
     """
-    processed, user_ids = preprocess_new_data(raw_df)
-    predictions = model.predict(processed)
-    probs = model.predict_proba(processed)[:, 1]
+    codes = np.searchsorted(RISK_BINS, probs, side="left")
+    return pd.Categorical.from_codes(codes, categories=RISK_LABELS, ordered=True)
+
+
+def score_features(processed, user_ids, threshold=None,
+                   high_risk_threshold=HIGH_RISK_THRESHOLD) -> pd.DataFrame:
+    """
+    Score an already-encoded feature matrix with a single pass of the
+    memory-mapped compiled forest. Labels come from the probabilities: argmax
+    (exactly model.predict) by default, or churn_probability > `threshold`
+    when given. The same pass yields risk_level and the high_risk flag
+    (> `high_risk_threshold`).
+    """
+    model = get_compiled_forest()
+    proba = model.predict_proba(processed)
+    probs = proba[:, 1]
+    if threshold is None:
+        predictions = model.classes_.take(np.argmax(proba, axis=1))
+    else:
+        predictions = model.classes_.take((probs > threshold).astype(np.intp))
 
     # Combining with user_id
     result_df = pd.DataFrame({
         "user_id": user_ids,
         "churn_probability": probs,
-        "churn_prediction": predictions
+        "churn_prediction": predictions,
+        "risk_level": risk_levels(probs),
+        "high_risk": probs > high_risk_threshold,
     })
-    return result_df
+    return result_df[SCORE_COLUMNS]
+
+
+def score_aggregates(agg_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score per-user aggregates (aggregate_user_features output): SCORE_COLUMNS
+    with string user_ids, plus each user's device_type,
+    user_acquisition_channel and user_segment (last seen).
+    """
+    processed, user_ids = encode_features(agg_df)
+    scores = score_features(processed, user_ids.astype(str))
+    for col in CATEGORICAL_FEATURE_COLUMNS:
+        scores[col] = agg_df[f"{col}_last"].to_numpy()
+    return scores
+
+
+def predict_churn(raw_df: pd.DataFrame, threshold=None) -> pd.DataFrame:
+    """
+    Accept raw user-level data, preprocess, and return predictions + probabilities
+    """
+    processed, user_ids = preprocess_new_data(raw_df)
+    return score_features(processed, user_ids, threshold=threshold)
+
+
+def predict_churn_from_state(state) -> pd.DataFrame:
+    """
+    Score every user in a feature_state.UserFeatureState without touching raw history
+    """
+    processed, user_ids = state.to_features()
+    return score_features(processed, user_ids)
+
+def predict_churn_chunked(source, output_path, chunksize=500_000, batch_size=50_000, store=None) -> str:
+    """
+    Out-of-core predict_churn for inputs larger than RAM.
+    `source` is a CSV/Parquet path (or partition directory) or an iterable of
+    raw DataFrame chunks in row order. Chunks are folded into per-user partial
+    aggregates, then users are scored in batches of `batch_size` and appended
+    to the `output_path` CSV, so memory depends on the user count, not the
+    number of rows. With a risk_store.RiskScoreStore as `store`, each batch is
+    upserted into it too and, once all are written, users missing from this
+    run are deleted from it.
+    """
+    from feature_state import UserFeatureState
+
+    if isinstance(source, (str, os.PathLike)):
+        source = iter_mobile_analytics(source, chunksize=chunksize)
+
+    state = None
+    for chunk in source:
+        partial = UserFeatureState.from_frame(chunk)
+        state = partial if state is None else state.merge(partial)
+
+    scored_at = store.timestamp() if store is not None else None
+    stats = state.stats.sort_index() if state is not None else pd.DataFrame()
+    for start in range(0, max(len(stats), 1), batch_size):
+        batch = UserFeatureState(stats.iloc[start:start + batch_size])
+        if len(batch):
+            scores = score_aggregates(batch.to_aggregates())
+            if store is not None:
+                store.upsert(scores, scored_at=scored_at)
+            result_df = scores[SCORE_COLUMNS]
+        else:
+            result_df = pd.DataFrame(columns=SCORE_COLUMNS)
+        result_df.to_csv(output_path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+    if store is not None:
+        store.prune(scored_at)
+    return output_path
+
+def _init_scoring_worker():
+    """
+    Process-pool initializer: map the compiled forest and encoder once per
+    worker. Partitions of any size score on them (NumPy, single-threaded),
+    so workers never load the pickled model or start sklearn thread pools.
+    """
+    get_compiled_forest()
+    get_feature_encoder()
+
+
+def predict_churn_parallel(raw_df: pd.DataFrame, workers=None, batch_size=50_000) -> pd.DataFrame:
+    """
+    predict_churn over hash partitions of users in a process pool.
+    Users are split into roughly `batch_size`-user partitions by a hash of
+    user_id (at least one per worker); each partition is preprocessed and
+    scored independently and the results come back sorted by user_id,
+    like predict_churn.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    user_ids = raw_df["user_id"].astype(str).to_numpy()
+    n_users = len(pd.unique(user_ids))
+    n_partitions = max(workers, -(-n_users // batch_size))
+
+    partition = pd.util.hash_array(user_ids) % np.uint64(n_partitions)
+    parts = [part for _, part in raw_df.groupby(partition, sort=True)]
+    if isinstance(raw_df["user_id"].dtype, pd.CategoricalDtype):
+        # each pickled partition carries only its own users' categories
+        parts = [part.assign(user_id=part["user_id"].cat.remove_unused_categories()) for part in parts]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_scoring_worker) as pool:
+        results = list(pool.map(predict_churn, parts))
+
+    result_df = pd.concat(results, ignore_index=True)
+    result_df["user_id"] = result_df["user_id"].astype(str)
+    return result_df.sort_values("user_id", ignore_index=True)
 
 # ====================================================
 # 4️⃣  Running directly for quick test
 # ====================================================
 if __name__ == "__main__":
     print("🔍 Loading test data...")
-    test_data = pd.read_csv("data/mobile_analytics.csv")
+    from datasets import read_dataset
+    test_data = read_dataset("mobile_analytics")
 
     print("⚙️  Running churn predictions...")
     results = predict_churn(test_data)
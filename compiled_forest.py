@@ -0,0 +1,209 @@
+# compiled_forest.py
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+
+# ====================================================
+# Flattened random forest for low-latency scoring
+# ====================================================
+# All trees are concatenated into contiguous node arrays (children, split
+# feature/threshold, missing-value direction, leaf class values). Leaves point
+# at themselves, so a fixed number of vectorized steps walks rows through the
+# trees. Arrays are saved as .npy files and memory-mapped on load, so all
+# worker processes share one physical copy.
+#
+# Small batches (up to WIDE_WALK_ROWS) walk every tree at once, max_depth
+# steps over a (rows x trees) node array: few NumPy calls, lowest latency.
+# Larger ones are cut into blocks of BLOCK_ROWS and walk tree by tree: each
+# tree only as deep as it is, over its own small node slices that stay in
+# cache, with memory at a few MB however many rows are scored.
+NODE_ARRAYS = ["left", "right", "feature", "threshold", "missing_left", "value", "roots"]
+WIDE_WALK_ROWS = 768
+BLOCK_ROWS = 16384
+
+
+class CompiledForest:
+    """
+    Array form of a fitted sklearn RandomForestClassifier.
+    predict_proba matches the forest's predict_proba bit for bit: inputs are
+    compared as float32 like sklearn's trees, leaf values are summed in
+    estimator order and divided by the number of trees.
+    """
+
+    def __init__(self, arrays, feature_names, classes, max_depth, source_sha256=None):
+        for name in NODE_ARRAYS:
+            setattr(self, name, arrays[name])
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.classes_ = np.asarray(classes)
+        self.max_depth = int(max_depth)
+        self.n_estimators = len(self.roots)
+        # Walk helpers: one gather picks the child ([right, left] per node)
+        self._children = np.stack([self.right, self.left], axis=1).ravel().astype(np.intp)
+        self._feature = np.asarray(self.feature, dtype=np.intp)
+        # Tree-by-tree walk: node ranges, depths, children local to each tree
+        # and the column a node reads (see _tree_leaves)
+        self._bounds = np.append(self.roots, len(self.left)).astype(np.intp)
+        self._depths = self._tree_depths()
+        self._local_children = self._children - np.repeat(self._bounds[:-1], 2 * np.diff(self._bounds))
+        n_features = len(self.feature_names_in_)
+        self._column = self._feature + np.where(self.missing_left, 0, n_features)
+        # Fingerprint of the pickled model this forest was compiled from
+        self.source_sha256 = source_sha256
+
+    def _tree_depths(self) -> np.ndarray:
+        """Depth of every tree, from the node arrays"""
+        depth = np.zeros(len(self.left), dtype=np.intp)
+        internal = np.flatnonzero(self.left != np.arange(len(self.left)))
+        for _ in range(self.max_depth):  # children come after their parent
+            depth[self.left[internal]] = depth[self.right[internal]] = depth[internal] + 1
+        return np.maximum.reduceat(depth, self._bounds[:-1]) if len(self.roots) else depth[:0]
+
+    # --------------- Compile / persist ------------------
+    @classmethod
+    def from_sklearn(cls, model, source_sha256=None) -> "CompiledForest":
+        """Flatten every tree of a fitted forest into shared node arrays"""
+        left, right, feature, threshold, missing_left, value, roots = [], [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = tree.__getstate__()["nodes"]
+            index = np.arange(tree.node_count)
+            is_leaf = nodes["left_child"] == -1
+
+            left.append(np.where(is_leaf, index, nodes["left_child"]) + offset)
+            right.append(np.where(is_leaf, index, nodes["right_child"]) + offset)
+            feature.append(np.where(is_leaf, 0, nodes["feature"]))
+            threshold.append(nodes["threshold"])
+            missing_left.append(
+                nodes["missing_go_to_left"].astype(bool)
+                if "missing_go_to_left" in nodes.dtype.names else np.zeros(tree.node_count, dtype=bool)
+            )
+            value.append(tree.value[:, 0, :])
+            roots.append(offset)
+            offset += tree.node_count
+
+        arrays = {
+            "left": np.concatenate(left).astype(np.int32),
+            "right": np.concatenate(right).astype(np.int32),
+            "feature": np.concatenate(feature).astype(np.int32),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "missing_left": np.concatenate(missing_left),
+            "value": np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+            "roots": np.asarray(roots, dtype=np.int32),
+        }
+        max_depth = max(estimator.tree_.max_depth for estimator in model.estimators_)
+        return cls(arrays, model.feature_names_in_, model.classes_, max_depth, source_sha256)
+
+    def save(self, directory):
+        """
+        Write into a staging directory, then swap it in with renames: files
+        already memory-mapped by running processes are never truncated, and
+        loaders see the old artifact, the new one, or none (meta.json missing).
+        """
+        directory = os.path.abspath(directory)
+        parent = os.path.dirname(directory)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(directory)}-")
+        for name in NODE_ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), getattr(self, name))
+        meta = {
+            "feature_names": list(self.feature_names_in_),
+            "classes": self.classes_.tolist(),
+            "max_depth": self.max_depth,
+            "source_sha256": self.source_sha256,
+        }
+        with open(os.path.join(staging, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        retired = None
+        if os.path.exists(directory):
+            retired = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(directory)}-old-")
+            os.rename(directory, os.path.join(retired, "artifact"))
+        os.rename(staging, directory)
+        if retired is not None:
+            shutil.rmtree(retired, ignore_errors=True)  # unlinked files stay valid for existing maps
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r") -> "CompiledForest":
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in NODE_ARRAYS
+        }
+        return cls(arrays, meta["feature_names"], meta["classes"], meta["max_depth"], meta.get("source_sha256"))
+
+    # --------------- Evaluation ------------------
+    def _apply_block(self, X) -> np.ndarray:
+        """Wide walk: leaves of every tree at once, shape (n_rows, n_trees)"""
+        flat = np.ascontiguousarray(X).ravel()
+        has_nan = np.isnan(flat).any()
+        base = (np.arange(len(X), dtype=np.intp) * X.shape[1])[:, None]
+        node = np.repeat(self.roots[None, :].astype(np.intp), len(X), axis=0)
+        for _ in range(self.max_depth):
+            x = flat.take(base + self._feature.take(node))
+            go_left = x <= self.threshold.take(node)  # NaN compares False: goes right
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left.take(node)
+            node = self._children.take(node * 2 + go_left)
+        return node
+
+    def _tree_leaves(self, X):
+        """Tree-by-tree walk: yield (tree, leaf of every row) in estimator order"""
+        n_rows, n_features = X.shape
+        # Column-major copies of the block: at missing_left nodes a node reads
+        # the first one, where NaN is -inf (<= any threshold: goes left);
+        # elsewhere the second, where NaN compares False and goes right
+        columns = np.empty((2, n_features, n_rows), dtype=np.float32)
+        columns[0] = columns[1] = X.T
+        columns[0][np.isnan(columns[0])] = -np.inf
+        flat = columns.ravel()
+        rows = np.arange(n_rows, dtype=np.intp)
+        for tree, (start, stop) in enumerate(zip(self._bounds[:-1], self._bounds[1:])):
+            offset = self._column[start:stop] * n_rows
+            threshold = self.threshold[start:stop]
+            children = self._local_children[2 * start:2 * stop]
+            node = np.zeros(n_rows, dtype=np.intp)
+            for _ in range(self._depths[tree]):
+                go_left = flat.take(offset.take(node) + rows) <= threshold.take(node)
+                node = children.take(node * 2 + go_left)
+            yield tree, node + start
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf node (global index) reached in every tree, shape (n_rows, n_trees)"""
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) <= WIDE_WALK_ROWS:
+            return self._apply_block(X)
+        leaves = np.empty((len(X), self.n_estimators), dtype=np.intp)
+        for start in range(0, len(X), BLOCK_ROWS):
+            for tree, leaf in self._tree_leaves(X[start:start + BLOCK_ROWS]):
+                leaves[start:start + BLOCK_ROWS, tree] = leaf
+        return leaves
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities, shape (n_rows, n_classes)"""
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) <= WIDE_WALK_ROWS:
+            # cumsum adds trees left to right, like sklearn's `out += prediction`
+            return np.cumsum(self.value[self._apply_block(X)], axis=1)[:, -1] / self.n_estimators
+        proba = np.zeros((len(X), self.value.shape[1]), dtype=np.float64)
+        for start in range(0, len(X), BLOCK_ROWS):
+            block = proba[start:start + BLOCK_ROWS]
+            for _, leaf in self._tree_leaves(X[start:start + BLOCK_ROWS]):
+                block += self.value.take(leaf, axis=0)  # estimator order, like sklearn
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+if __name__ == "__main__":
+    from churn_model import COMPILED_FOREST_PATH, MODEL_PATH, get_model, file_sha256
+
+    print("🔧 Compiling churn forest...")
+    forest = CompiledForest.from_sklearn(get_model(), file_sha256(MODEL_PATH))
+    forest.save(COMPILED_FOREST_PATH)
+    print(f"✅ {forest.n_estimators} trees, {len(forest.left):,} nodes saved to '{COMPILED_FOREST_PATH}'")
@@ -0,0 +1,634 @@
+# dashboard.py
+# The Dash app; app.py imports it in a background warm-up (see app.py)
+import os
+import sqlite3
+from functools import partial
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from dash import Dash, dcc, html, Input, Output, State, no_update
+from chart_aggregates import histogram_bins, box_stats, histogram_figure, box_figure
+from churn_cache import ChurnResultCache, summarize_churn
+from data_snapshot import SnapshotManager, source_scope
+from figure_cache import FigureCache
+from shared_store import SharedDataStore
+from scoring_service import register_scoring_routes
+from risk_store import RiskScoreStore
+from callback_metrics import CallbackMetrics, register_metrics_route
+from analytics_schema import CATEGORY_LEVELS
+from datasets import DATASETS, read_dataset
+from activity_cube import ActivityCube
+
+
+# ========== DATA SNAPSHOTS ==========
+# Source files are reloaded in the background only when they change; every
+# callback reads one immutable snapshot (see data_snapshot.py)
+DATA_SOURCES = {
+    'dua': (DATASETS['advanced_dua'].path, partial(read_dataset, 'advanced_dua')),
+    'ret': (DATASETS['advanced_retention'].path, partial(read_dataset, 'advanced_retention')),
+    'mobile': (DATASETS['mobile_analytics'].path, partial(read_dataset, 'mobile_analytics')),
+}
+
+
+def prepare_data(frames):
+    """Derived columns, KPIs and chart summaries for one snapshot"""
+    dua_df, ret_df, mobile_df = frames['dua'], frames['ret'], frames['mobile']
+
+    # Derive metrics once
+    dua_df = dua_df.assign(
+        sessions_per_user=dua_df['total_sessions'] / dua_df['dau'],
+        dau_growth=dua_df['dau'].pct_change() * 100,
+    )
+
+    # Exact distribution summaries over the full mobile_df (see chart_aggregates.py)
+    duration_hist = histogram_bins(mobile_df['session_duration'])
+    duration_by_device = box_stats(mobile_df, 'device_type', 'session_duration')
+    duration_by_channel = box_stats(mobile_df, 'user_acquisition_channel', 'session_duration')
+
+    # Date x segment x device x channel cube behind the filter controls (see activity_cube.py)
+    activity_cube = ActivityCube.from_frame(mobile_df)
+
+    return {
+        'dua_df': dua_df,
+        'ret_df': ret_df,
+        'mobile_df': mobile_df,
+        'duration_hist': duration_hist,
+        'duration_by_device': duration_by_device,
+        'duration_by_channel': duration_by_channel,
+        'activity_cube': activity_cube,
+        'total_dau': dua_df['dau'].mean(),
+        'avg_session': dua_df['avg_session_duration'].mean(),
+        'avg_retention': ret_df['retention_rate'].mean(),
+        'total_opens': mobile_df['app_opens'].sum(),
+        'avg_screens': dua_df['avg_screens_per_session'].mean(),
+    }
+
+
+# Frames are published once per host as memory-mapped columns that every
+# worker maps (see shared_store.py). Churn results are scored in the background
+# for every published snapshot, once per host, and written to the risk store;
+# section figures are cached on disk per data version for all workers
+# Per-deployment store/cache directories (keyed by the resolved source paths)
+data_scope = source_scope(path for path, _ in DATA_SOURCES.values())
+figure_cache = FigureCache(scope=data_scope)
+try:
+    risk_store = RiskScoreStore()
+except sqlite3.Error as e:  # read-only deployment: churn summaries only
+    print(f" Risk store unavailable, churn scores are not persisted: {e}")
+    risk_store = None
+churn_cache = ChurnResultCache(partial(summarize_churn, store=risk_store), shared=figure_cache)
+snapshots = SnapshotManager(
+    DATA_SOURCES,
+    prepare=prepare_data,
+    store=SharedDataStore(scope=data_scope),
+    on_publish=[
+        lambda snap: churn_cache.refresh(snap.version, snap['mobile_df']),
+        lambda snap: figure_cache.prune(snap.version),
+    ],
+)
+
+print("Loading data...")
+startup = snapshots.load()
+snapshots.watch(float(os.environ.get('DATA_WATCH_SECONDS', 60)))
+print("Data loaded successfully!")
+
+# ========== PRECOMPUTE METRICS ==========
+total_dau = startup['total_dau']
+avg_session = startup['avg_session']
+avg_retention = startup['avg_retention']
+total_opens = startup['total_opens']
+avg_screens = startup['avg_screens']
+startup_dates = [d.date() for d in (startup['mobile_df']['date'].min(), startup['mobile_df']['date'].max())]
+
+# ========== KPI CARDS ==========
+def create_kpi_card(title, value, color):
+    return html.Div(
+        style={
+            'backgroundColor': color,
+            'borderRadius': '15px',
+            'padding': '15px',
+            'width': '18%',
+            'minWidth': '150px',
+            'color': 'white',
+            'textAlign': 'center',
+            'boxShadow': '2px 2px 8px rgba(0,0,0,0.2)'
+        },
+        children=[
+            html.H4(title, style={'fontSize': '16px', 'margin': '5px 0'}),
+            html.H2(value, style={'fontSize': '24px', 'margin': '5px 0'})
+        ]
+    )
+
+kpi_cards = [
+    create_kpi_card('👥 Avg Daily Active Users', f'{total_dau:,.0f}', '#3498db'),
+    create_kpi_card('⏱️ Avg Session Duration', f'{avg_session:.1f} min', '#2ecc71'),
+    create_kpi_card('🔄 Retention Rate', f'{avg_retention:.1f}%', '#e74c3c'),
+    create_kpi_card('📱 Total App Opens', f'{total_opens:,.0f}', '#f39c12'),
+    create_kpi_card('📊 Avg Screens/Session', f'{avg_screens:.1f}', '#9b59b6')
+]
+
+# ========== INITIALIZE APP ==========
+app = Dash(__name__)
+app.config.suppress_callback_exceptions = True
+# Exposing the underlying Flask server (needed for deployment)
+server = app.server
+# JSON churn scoring for the CRM: POST /api/churn/score, GET /api/churn/latency
+register_scoring_routes(server)
+# Per-callback wall/CPU time, peak memory and response size: GET /metrics (Prometheus)
+metrics = CallbackMetrics()
+register_metrics_route(server, metrics)
+# ========== APP LAYOUT ==========
+app.layout = html.Div([
+    html.H1(" Mobile App Analytics Dashboard", style={'textAlign': 'center', 'marginBottom': '20px', 'color': '#2c3e50'}),
+    
+    # KPI Cards
+    html.Div(kpi_cards, style={'display': 'flex', 'justifyContent': 'space-between', 'margin': '30px 0', 'flexWrap': 'wrap', 'gap': '10px'}),
+    
+    # ========== EXECUTIVE SUMMARY SECTION ==========
+    html.Div([
+        html.H2("📊 Executive Summary", style={
+            'textAlign': 'center', 
+            'color': '#2c3e50', 
+            'marginTop': '40px',
+            'marginBottom': '20px'
+        }),
+        html.Div([
+            html.Div([
+                html.H4("Key Insights", style={'color': '#2980b9', 'marginBottom': '15px'}),
+                html.Ul([
+                    html.Li(f"Daily active users averaged {total_dau:,.0f} with an average session duration of {avg_session:.1f} minutes"),
+                    html.Li(f"User retention rate stands at {avg_retention:.1f}%, indicating {'strong' if avg_retention > 40 else 'moderate' if avg_retention > 25 else 'weak'} user engagement"),
+                    html.Li(f"Users view an average of {avg_screens:.1f} screens per session"),
+                    html.Li(f"Total app opens reached {total_opens:,.0f} across the analysis period")
+                ], style={'lineHeight': '1.8', 'fontSize': '15px'})
+            ], style={
+                'backgroundColor': '#e8f4f8',
+                'padding': '20px',
+                'borderRadius': '10px',
+                'width': '48%',
+                'minWidth': '300px',
+                'boxShadow': '0 2px 5px rgba(0,0,0,0.1)'
+            }),
+            
+            html.Div([
+                html.H4("Recommendations", style={'color': '#27ae60', 'marginBottom': '15px'}),
+                html.Ul([
+                    html.Li("Focus retention efforts on high-churn segments identified in predictions"),
+                    html.Li("Optimize onboarding flow to increase early engagement"),
+                    html.Li("Implement personalized push notifications for at-risk users"),
+                    html.Li("A/B test features to improve session duration and screen views")
+                ], style={'lineHeight': '1.8', 'fontSize': '15px'})
+            ], style={
+                'backgroundColor': '#e8f8f5',
+                'padding': '20px',
+                'borderRadius': '10px',
+                'width': '48%',
+                'minWidth': '300px',
+                'boxShadow': '0 2px 5px rgba(0,0,0,0.1)'
+            })
+        ], style={
+            'display': 'flex',
+            'justifyContent': 'space-between',
+            'gap': '20px',
+            'marginBottom': '40px',
+            'flexWrap': 'wrap'
+        })
+    ], style={'marginTop': '30px'}),
+
+    # ========== FILTERED EXPLORER (ANSWERED FROM THE ACTIVITY CUBE) ==========
+    html.Div([
+        html.H2("🔎 Explore by Date, Segment, Device & Channel", style={'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '20px'}),
+        html.Div([
+            dcc.DatePickerRange(
+                id='filter-dates',
+                min_date_allowed=startup_dates[0], max_date_allowed=startup_dates[1],
+                start_date=startup_dates[0], end_date=startup_dates[1],
+            ),
+            dcc.Dropdown(id='filter-segment', multi=True, placeholder='All segments',
+                         options=CATEGORY_LEVELS['user_segment'], style={'minWidth': '220px', 'flex': '1'}),
+            dcc.Dropdown(id='filter-device', multi=True, placeholder='All devices',
+                         options=CATEGORY_LEVELS['device_type'], style={'minWidth': '180px', 'flex': '1'}),
+            dcc.Dropdown(id='filter-channel', multi=True, placeholder='All channels',
+                         options=CATEGORY_LEVELS['user_acquisition_channel'], style={'minWidth': '220px', 'flex': '1'}),
+        ], style={'display': 'flex', 'gap': '10px', 'flexWrap': 'wrap', 'alignItems': 'center', 'marginBottom': '20px'}),
+        html.Div(id='filter-kpis', style={'display': 'flex', 'justifyContent': 'space-between', 'flexWrap': 'wrap', 'gap': '10px'}),
+        html.Div([
+            dcc.Graph(id='filter-daily', style={'width': '60%', 'minWidth': '300px'}),
+            dcc.Graph(id='filter-breakdown', style={'width': '40%', 'minWidth': '300px'}),
+        ], style={'display': 'flex', 'flexWrap': 'wrap'}),
+    ], style={'marginBottom': '40px'}),
+    
+    # ========== REFRESH BUTTON ==========
+    html.Div([
+        html.Button(" Refresh Data", id='refresh-btn',
+                    style={
+                        'margin': '10px auto',
+                        'display': 'block',
+                        'padding': '12px 30px',
+                        'fontSize': '16px',
+                        'backgroundColor': '#2980b9',
+                        'color': 'white',
+                        'border': 'none',
+                        'borderRadius': '8px',
+                        'cursor': 'pointer',
+                        'boxShadow': '0 2px 5px rgba(0,0,0,0.2)',
+                        'transition': 'background-color 0.3s'
+                    }),
+        dcc.ConfirmDialog(id='refresh-dialog', message=' Data refreshed successfully!')
+    ], style={'textAlign': 'center', 'marginBottom': '30px'}),    
+    # Store to track what's been loaded
+    dcc.Store(id='growth-loaded', data=False),
+    dcc.Store(id='retention-loaded', data=False),
+    dcc.Store(id='user-loaded', data=False),
+    
+    # Collapsible sections
+    html.Div([
+        dcc.Loading(
+            id="loading-growth",
+            type="circle",
+            children=[
+                html.Button(" Toggle Growth & Engagement Charts", id='btn-growth', n_clicks=0, 
+                           style={'margin': '10px', 'padding': '12px 24px', 'fontSize': '16px', 'cursor': 'pointer', 
+                                  'backgroundColor': '#3498db', 'color': 'white', 'border': 'none', 'borderRadius': '5px'}),
+                html.Div(id='growth-section', style={'display': 'none'})
+            ]
+        ),
+        #Retention section
+        dcc.Loading(
+            id="loading-retention",
+            type="circle",
+             children=[
+                html.Button(" Toggle Retention Analytics", id='btn-retention', n_clicks=0,
+                           style={
+                               'margin': '10px', 
+                               'padding': '12px 24px', 
+                               'fontSize': '16px', 
+                               'cursor': 'pointer',
+                               'backgroundColor': '#e74c3c', 
+                               'color': 'white', 
+                               'border': 'none', 
+                               'borderRadius': '5px',
+                               'boxShadow': '0 2px 5px rgba(0,0,0,0.15)'
+                           }),
+                html.Div(id='retention-section', style={'display': 'none'})
+            ]
+        ),
+
+        #User behavior section
+        dcc.Loading(
+            id="loading-user",
+            type="circle",
+            children=[
+                html.Button(" Toggle User Behavior & Funnel", id='btn-user', n_clicks=0,
+                           style={
+                               'margin': '10px', 
+                               'padding': '12px 24px', 
+                               'fontSize': '16px', 
+                               'cursor': 'pointer',
+                               'backgroundColor': '#9b59b6', 
+                               'color': 'white', 
+                               'border': 'none', 
+                               'borderRadius': '5px',
+                               'boxShadow': '0 2px 5px rgba(0,0,0,0.15)'
+                           }),
+                html.Div(id='user-section', style={'display': 'none'})
+            ]
+        ),
+
+        # Churn Prediction Section
+        dcc.Loading(
+            id="loading-churn",
+            type="circle",
+            children=[
+                html.Button(" Toggle Churn Prediction Results", id='btn-churn', n_clicks=0,
+                           style={'margin': '10px', 'padding': '12px 24px', 'fontSize': '16px', 'cursor': 'pointer',
+                                  'backgroundColor': '#16a085', 'color': 'white', 'border': 'none', 'borderRadius': '5px', 'boxShadow': '0 2px 5px rgba(0,0,0,0.15)'}),
+                html.Div(id='churn-section', style={'display': 'none'})
+            ]
+        ),
+    ])
+], style={'padding': '20px', 'maxWidth': '1400px', 'margin': '0 auto'})
+
+# ========== OPTIMIZED CALLBACKS WITH LAZY LOADING ==========
+# Growth & Engagement Callback
+@app.callback(
+    Output('growth-section', 'children'),
+    Output('growth-section', 'style'),
+    Output('growth-loaded', 'data'),
+    Input('btn-growth', 'n_clicks'),
+    State('growth-loaded', 'data'),
+    prevent_initial_call=True
+)
+@metrics.track
+def toggle_growth(n_clicks, loaded):
+    if n_clicks % 2 == 1:  # Show
+        if not loaded:  # Generate only once
+            snap = snapshots.current
+
+            def build():
+                print("Generating growth charts...")
+                dua_df = snap['dua_df']
+                return [
+                    px.line(dua_df, x='date', y='dau', title='Daily Active Users').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.line(dua_df, x='date', y='total_sessions', title='Total Sessions').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.line(dua_df, x='date', y='avg_session_duration', title='Avg Session Duration').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.bar(dua_df, x='date', y='total_screens_viewed', title='Total Screens Viewed').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.line(dua_df, x='date', y='avg_screens_per_session', title='Avg Screens per Session').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.line(dua_df, x='date', y='sessions_per_user', title='Sessions per User').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.line(dua_df, x='date', y='dau_growth', title='DAU Growth Rate (%)').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40))
+                ]
+
+            # Built once per data version across all workers
+            charts = [dcc.Graph(figure=fig) for fig in figure_cache.get_or_build('growth', snap.version, build)]
+            return charts, {'display': 'block', 'marginTop': '20px'}, True
+        return no_update, {'display': 'block', 'marginTop': '20px'}, True
+    else:  # Hide
+        return no_update, {'display': 'none'}, loaded
+
+# Retention Analytics Callback
+@app.callback(
+    Output('retention-section', 'children'),
+    Output('retention-section', 'style'),
+    Output('retention-loaded', 'data'),
+    Input('btn-retention', 'n_clicks'),
+    State('retention-loaded', 'data'),
+    prevent_initial_call=True
+)
+@metrics.track
+def toggle_retention(n_clicks, loaded):
+    if n_clicks % 2 == 1:  # Show
+        if not loaded:  # Generate only once
+            snap = snapshots.current
+
+            def build():
+                print("Generating retention charts...")
+                ret_df = snap['ret_df']
+                return [
+                    px.line(ret_df, x='first_date', y='retention_rate', title='Retention Rate').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.line(ret_df, x='first_date', y='churn_rate', title='Churn Rate').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.line(ret_df, x='first_date', y='churn_rate_smooth', title='Smoothed Churn Rate').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40))
+                ]
+
+            # Built once per data version across all workers
+            charts = [dcc.Graph(figure=fig) for fig in figure_cache.get_or_build('retention', snap.version, build)]
+            return charts, {'display': 'block', 'marginTop': '20px'}, True
+        return no_update, {'display': 'block', 'marginTop': '20px'}, True
+    else:  # Hide
+        return no_update, {'display': 'none'}, loaded
+
+# User Behavior Callback
+@app.callback(
+    Output('user-section', 'children'),
+    Output('user-section', 'style'),
+    Output('user-loaded', 'data'),
+    Input('btn-user', 'n_clicks'),
+    State('user-loaded', 'data'),
+    prevent_initial_call=True
+)
+@metrics.track
+def toggle_user(n_clicks, loaded):
+    if n_clicks % 2 == 1:  # Show
+        if not loaded:  # Generate only once
+            snap = snapshots.current
+
+            def build():
+                print("Generating user behavior charts...")
+                mobile_df = snap['mobile_df']
+
+                # Aggregate data for funnel to avoid large datasets
+                funnel_df = pd.DataFrame({
+                    'stage': ['App Opens', 'Screens Viewed', 'Session Minutes'],
+                    'value': [
+                        mobile_df['app_opens'].sum(),
+                        mobile_df['screens_viewed'].sum(),
+                        mobile_df['session_duration'].sum()
+                    ]
+                })
+
+                # Use aggregated data for bar charts
+                segment_screens = mobile_df.groupby('user_segment', observed=True)['screens_viewed'].mean().reset_index()
+                segment_duration = mobile_df.groupby('user_segment', observed=True)['session_duration'].mean().reset_index()
+
+                return [
+                    histogram_figure(snap['duration_hist'], 'Session Duration Distribution', 'session_duration').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    box_figure(snap['duration_by_device'], 'device_type', 'Session Duration by Device', 'session_duration').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    box_figure(snap['duration_by_channel'], 'user_acquisition_channel', 'Session Duration by Channel', 'session_duration').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.bar(segment_screens, x='user_segment', y='screens_viewed', title='Avg Screens per Segment').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.bar(segment_duration, x='user_segment', y='session_duration', title='Avg Session Duration per Segment').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40)),
+                    px.funnel(funnel_df, x='value', y='stage', title='User Engagement Funnel').update_layout(height=350, template='plotly_white', margin=dict(l=40, r=40, t=40, b=40))
+                ]
+
+            # Built once per data version across all workers
+            charts = [dcc.Graph(figure=fig) for fig in figure_cache.get_or_build('user', snap.version, build)]
+            return charts, {'display': 'block', 'marginTop': '20px'}, True
+        return no_update, {'display': 'block', 'marginTop': '20px'}, True
+    else:  # Hide
+        return no_update, {'display': 'none'}, loaded
+
+# Filtered Explorer Callback
+# Layout resolved once: building go/px figures re-applies the template on every
+# call, which costs far more than the cube roll-ups themselves
+FILTER_FIGURE_LAYOUT = go.Layout(template='plotly_white', height=350, margin=dict(l=40, r=40, t=40, b=40)).to_plotly_json()
+
+@app.callback(
+    Output('filter-kpis', 'children'),
+    Output('filter-daily', 'figure'),
+    Output('filter-breakdown', 'figure'),
+    Input('filter-dates', 'start_date'),
+    Input('filter-dates', 'end_date'),
+    Input('filter-segment', 'value'),
+    Input('filter-device', 'value'),
+    Input('filter-channel', 'value'),
+)
+@metrics.track
+def update_filtered_view(start_date, end_date, segments, devices, channels):
+    # Roll-ups over pre-aggregated cells only; never rescans activity rows
+    cube = snapshots.current['activity_cube'].filter(
+        start=start_date, end=end_date,
+        user_segment=segments, device_type=devices, user_acquisition_channel=channels,
+    )
+    totals = cube.rollup()
+    total = totals.iloc[0] if len(totals) else None
+    daily = cube.rollup('date')
+    by_channel = cube.rollup('user_acquisition_channel')
+
+    kpis = [
+        create_kpi_card('🧮 Sessions', f"{total['sessions']:,.0f}" if total is not None else '0', '#34495e'),
+        create_kpi_card('👥 Active Users (≈)', f"{total['active_users']:,.0f}" if total is not None else '0', '#3498db'),
+        create_kpi_card('⏱️ Avg Session Duration', f"{total['avg_session_duration']:.1f} min" if total is not None else '–', '#2ecc71'),
+        create_kpi_card('📊 Avg Screens/Session', f"{total['avg_screens_per_session']:.1f}" if total is not None else '–', '#9b59b6'),
+        create_kpi_card('📱 App Opens', f"{total['opens_sum']:,.0f}" if total is not None else '0', '#f39c12'),
+    ]
+
+    fig_daily = {
+        'data': [
+            {'type': 'scatter', 'mode': 'lines', 'name': 'Sessions', 'x': daily['date'].dt.strftime('%Y-%m-%d').tolist(), 'y': daily['sessions'].tolist()},
+            {'type': 'scatter', 'mode': 'lines', 'name': 'Active users (≈)', 'x': daily['date'].dt.strftime('%Y-%m-%d').tolist(), 'y': daily['active_users'].tolist()},
+        ],
+        'layout': {**FILTER_FIGURE_LAYOUT, 'title': {'text': 'Daily Sessions & Active Users'}, 'legend': {'orientation': 'h'}},
+    }
+    fig_breakdown = {
+        'data': [
+            {'type': 'bar', 'x': by_channel['user_acquisition_channel'].astype(str).tolist(), 'y': by_channel['active_users'].tolist(),
+             'customdata': by_channel[['sessions', 'avg_session_duration']].round(1).to_numpy().tolist(),
+             'hovertemplate': '%{x}<br>active users ≈ %{y:,}<br>sessions %{customdata[0]:,}<br>avg duration %{customdata[1]} min<extra></extra>'},
+        ],
+        'layout': {**FILTER_FIGURE_LAYOUT, 'title': {'text': 'Active Users by Channel (≈)'}},
+    }
+    return kpis, fig_daily, fig_breakdown
+
+# Churn Prediction Callback
+# How long a click waits for churn scores still being computed
+CHURN_WAIT_SECONDS = 0.5
+
+
+def churn_pending_message():
+    return html.Div([
+        html.H3("⏳ Churn predictions are being computed", style={'color': '#e67e22'}),
+        html.P("Scoring every user runs in the background after each data load. "
+               "Toggle this section again in a few seconds.", style={'color': '#555', 'fontSize': '14px'}),
+    ], style={
+        'backgroundColor': '#fef5e7',
+        'padding': '20px',
+        'borderRadius': '10px',
+        'margin': '20px 0'
+    })
+
+
+@app.callback(
+    Output('churn-section', 'children'),
+    Output('churn-section', 'style'),
+    Input('btn-churn', 'n_clicks'),
+    prevent_initial_call=True
+)
+@metrics.track
+def toggle_churn(n_clicks):
+    if n_clicks % 2 == 1:
+        print("Generating churn prediction results...")
+
+        
+        try:
+            # Scored in the background for each snapshot; a short wait, then the
+            # last finished result (previous data version) or a placeholder
+            version = snapshots.current.version
+            scored_version, churn = churn_cache.latest(version, timeout=CHURN_WAIT_SECONDS)
+            if churn is None:
+                return [churn_pending_message()], {'display': 'block', 'marginTop': '20px'}
+
+            # Create visualizations
+            edges = churn['probability_edges']
+            fig1 = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=churn['probability_counts'],
+                                    width=edges[1] - edges[0]))
+            fig1.update_layout(title=' Predicted Churn Probability Distribution',
+                               xaxis_title='Churn Probability', yaxis_title='count', bargap=0)
+            fig1.update_layout(height=400, template='plotly_white', 
+                              margin=dict(l=40, r=40, t=60, b=40))
+
+            fig2 = px.bar(churn['segment_rates'],
+                          x='user_segment', y='churn_prediction',
+                          title=' Average Churn Rate by User Segment',
+                          labels={'churn_prediction': 'Avg Churn Rate', 'user_segment': 'User Segment'})
+            fig2.update_layout(height=400, template='plotly_white',
+                              margin=dict(l=40, r=40, t=60, b=40))
+            
+            # High-risk users (> 70%), flagged in the same scoring pass
+            high_risk_count = churn['high_risk_count']
+            
+            # Summary metrics
+            avg_churn_prob = churn['avg_churn_prob']
+            predicted_churners = churn['predicted_churners']
+            
+            summary_card = html.Div([
+                html.H3("🚨 Churn Prediction Summary", style={'color': '#e74c3c', 'marginBottom': '15px'}),
+                html.Div([
+                    html.Div([
+                        html.H4(f"{avg_churn_prob:.1%}", style={'color': '#e74c3c', 'margin': '5px'}),
+                        html.P("Avg Churn Probability", style={'fontSize': '14px'})
+                    ], style={
+                        'textAlign': 'center', 
+                        'padding': '15px', 
+                        'backgroundColor': '#f8f9fa', 
+                        'borderRadius': '10px', 
+                        'margin': '10px',
+                        'flex': '1',
+                        'minWidth': '150px'
+                    }),
+                    html.Div([
+                        html.H4(f"{predicted_churners:,.0f}", style={'color': '#e67e22', 'margin': '5px'}),
+                        html.P("Predicted Churners", style={'fontSize': '14px'})
+                    ], style={
+                        'textAlign': 'center', 
+                        'padding': '15px', 
+                        'backgroundColor': '#f8f9fa', 
+                        'borderRadius': '10px', 
+                        'margin': '10px',
+                        'flex': '1',
+                        'minWidth': '150px'
+                    }),
+                    html.Div([
+                        html.H4(f"{high_risk_count:,.0f}", style={'color': '#c0392b', 'margin': '5px'}),
+                        html.P("High-Risk Users (>70%)", style={'fontSize': '14px'})
+                    ], style={
+                        'textAlign': 'center', 
+                        'padding': '15px', 
+                        'backgroundColor': '#f8f9fa', 
+                        'borderRadius': '10px', 
+                        'margin': '10px',
+                        'flex': '1',
+                        'minWidth': '150px'
+                    }),
+                ], style={
+                    'display': 'flex', 
+                    'justifyContent': 'space-around', 
+                    'marginTop': '20px', 
+                    'flexWrap': 'wrap'
+                })
+            ], style={
+                'backgroundColor': '#ecf0f1', 
+                'padding': '20px', 
+                'borderRadius': '15px', 
+                'marginBottom': '30px',
+                'boxShadow': '0 2px 5px rgba(0,0,0,0.1)'
+            })
+
+            children = [summary_card, dcc.Graph(figure=fig1), dcc.Graph(figure=fig2)]
+            if scored_version != version:
+                children.insert(0, html.P(" Showing the last finished churn scores; the current data is "
+                                          "still being scored.", style={'color': '#777', 'fontSize': '13px'}))
+            return children, {'display': 'block', 'marginTop': '20px'}
+        
+        except Exception as e:
+            error_msg = html.Div([
+                html.H3(" Error in Churn Prediction", style={'color': '#e74c3c'}),
+                html.P(f"Error: {str(e)}", style={'color': '#555', 'fontSize': '14px'}),
+                html.P("Please ensure your data has the required columns for churn prediction.", 
+                      style={'color': '#777', 'fontSize': '13px', 'marginTop': '10px'})
+            ], style={
+                'backgroundColor': '#ffe6e6', 
+                'padding': '20px', 
+                'borderRadius': '10px',
+                'margin': '20px 0'
+            })
+            return [error_msg], {'display': 'block', 'marginTop': '20px'}
+    else:
+        return no_update, {'display': 'none'}
+
+# Refresh Data Callback
+@app.callback(
+    Output('refresh-dialog', 'displayed'),
+    Output('refresh-dialog', 'message'),
+    Input('refresh-btn', 'n_clicks'),
+    prevent_initial_call=True
+)
+@metrics.track
+def refresh_data(n_clicks):
+    # Only triggers the background reload; request threads never wait on it
+    if snapshots.refreshing:
+        return True, " A data refresh is already running."
+
+    snapshots.refresh()
+    message = f" Data refresh started (current data version {snapshots.current.version}). Changed files load in the background."
+    if snapshots.last_error is not None:
+        message += f" Last refresh failed: {snapshots.last_error}"
+    print(" Data refresh started...")
+    return True, message
@@ -0,0 +1,169 @@
+# data_snapshot.py
+import os
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+
+# ====================================================
+# Immutable dashboard data snapshots, refreshed in the background
+# ====================================================
+# Every source file is fingerprinted by (mtime_ns, size). A refresh reloads
+# only the files whose fingerprint changed, reuses the other frames, derives
+# columns/KPIs off the request path and publishes the new snapshot with a
+# single reference swap. Readers grab `manager.current` once per callback and
+# never see a half-updated mix. Snapshots (and their frames) must not be
+# mutated after publishing.
+#
+# With a shared_store.SharedDataStore, loading is done once per host: the
+# worker that notices a change loads and publishes it under the store's lock,
+# every worker serves the published memory-mapped frames, and `current` checks
+# the store's generation counter so a refresh reaches all workers (attaching
+# in the background, like any other refresh).
+
+
+def file_fingerprint(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def source_scope(paths) -> str:
+    """Digest of the resolved source paths: distinct per checkout/deployment on a host"""
+    resolved = sorted(os.path.realpath(path) for path in paths)
+    return hashlib.sha1("\n".join(resolved).encode()).hexdigest()[:10]
+
+
+def fingerprint_version(fingerprints) -> str:
+    """Content-derived version: identical files give the same version in every worker"""
+    digest = hashlib.sha1(repr(sorted(fingerprints.items())).encode())
+    return digest.hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    version: str
+    fingerprints: dict
+    frames: dict                      # source name -> loaded DataFrame
+    derived: dict                     # prepare(frames) output (derived frames, KPIs)
+    loaded_at: float = field(default_factory=time.time)
+
+    def __getitem__(self, key):
+        return self.derived[key] if key in self.derived else self.frames[key]
+
+
+class SnapshotManager:
+    """
+    Owns the current DataSnapshot for a set of sources {name: (path, loader)}.
+    `prepare(frames) -> dict` computes derived data and must not modify the
+    frames it is given (unchanged frames are shared between snapshots).
+    """
+
+    def __init__(self, sources, prepare=lambda frames: {}, on_publish=(), store=None):
+        self.sources = dict(sources)
+        self.prepare = prepare
+        self.on_publish = list(on_publish)
+        self.store = store
+        self.last_error = None
+        self._current = None
+        self._generation = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="data-refresh")
+        self._lock = threading.Lock()
+        self._pending = None
+        self._watcher = None
+
+    # --------------- Loading ------------------
+    def load(self) -> DataSnapshot:
+        """Synchronous refresh (startup): returns the published snapshot"""
+        return self.refresh().result()
+
+    def refresh(self):
+        """
+        Start a background reload, or join the one already running.
+        Returns a Future resolving to the current snapshot once it finishes.
+        """
+        with self._lock:
+            if self._pending is None or self._pending.done():
+                self._pending = self._executor.submit(self._reload)
+            return self._pending
+
+    @property
+    def current(self) -> DataSnapshot:
+        """
+        The snapshot to serve. If another worker published, the re-attach runs
+        in the background and the previous snapshot is served until it lands.
+        """
+        if self.store is not None and self._current is not None:
+            if self.store.generation() != self._generation:
+                self.refresh()
+        return self._current
+
+    @property
+    def refreshing(self) -> bool:
+        pending = self._pending
+        return pending is not None and not pending.done()
+
+    def _reload(self) -> DataSnapshot:
+        previous = self._current
+        try:
+            fingerprints = {name: file_fingerprint(path) for name, (path, _) in self.sources.items()}
+            if self.store is not None:
+                return self._reload_shared(previous, fingerprints)
+            if previous is not None and fingerprints == previous.fingerprints:
+                return previous  # nothing changed on disk
+            frames = self._load_frames(previous, fingerprints)
+            snapshot = DataSnapshot(fingerprint_version(fingerprints), fingerprints, frames, self.prepare(frames))
+        except Exception as e:
+            # Keep serving the last good snapshot
+            self.last_error = e
+            if previous is None:
+                raise
+            return previous
+        return self._publish(snapshot)
+
+    def _load_frames(self, previous, fingerprints):
+        frames = {}
+        for name, (path, loader) in self.sources.items():
+            unchanged = previous is not None and previous.fingerprints.get(name) == fingerprints[name]
+            frames[name] = previous.frames[name] if unchanged else loader(path)
+        return frames
+
+    def _reload_shared(self, previous, fingerprints):
+        with self.store.publish_lock():
+            generation = self.store.generation()
+            version = generation[1]
+            if version is None or self.store.fingerprints(version) != fingerprints:
+                # Files changed since the last publish: this worker loads them for everyone
+                version = fingerprint_version(fingerprints)
+                self.store.publish(version, fingerprints, self._load_frames(previous, fingerprints))
+                generation = self.store.generation()
+
+        if previous is not None and previous.version == version:
+            self._generation = generation
+            return previous
+        frames = self.store.open(version)
+        snapshot = DataSnapshot(version, self.store.fingerprints(version), frames, self.prepare(frames))
+        return self._publish(snapshot, generation)
+
+    def _publish(self, snapshot, generation=None):
+        # Hooks (e.g. background caches keyed by version) run before readers
+        # can see the new version
+        for callback in self.on_publish:
+            callback(snapshot)
+        self.last_error = None
+        self._generation = generation
+        self._current = snapshot  # atomic publish
+        return snapshot
+
+    # --------------- Watching ------------------
+    def watch(self, interval):
+        """Poll source fingerprints every `interval` seconds in a daemon thread"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.refresh()
+
+        if self._watcher is None and interval > 0:
+            self._watcher = threading.Thread(target=loop, name="data-watch", daemon=True)
+            self._watcher.start()
+        return self
@@ -0,0 +1,117 @@
+# datasets.py
+import os
+import glob
+import hashlib
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from analytics_schema import CSV_DTYPES, DATE_COLUMNS, compact_mobile_analytics
+from atomic_write import atomic_path
+
+# ====================================================
+# Typed dataset loading with columnar cache sidecars
+# ====================================================
+# Each dataset declares its CSV dtypes, date columns and an optional cast
+# applied after parsing. The first read parses the CSV and writes an Arrow IPC
+# (Feather, lz4) sidecar holding the typed frame; later reads of an unchanged
+# file come straight from the sidecar, dtypes and category levels included.
+# Sidecars are keyed by the source's path, mtime and size plus the declared
+# schema, so editing the CSV or its schema falls back to parsing once more.
+# Sidecars go to DATA_CACHE_DIR, or a .cache directory next to the source.
+SIDECAR_FORMAT = 1  # bump to invalidate every sidecar
+DATA_CACHE_DIR = os.environ.get("DATA_CACHE_DIR")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    path: str
+    dtypes: dict = field(default_factory=dict)   # read_csv dtypes
+    dates: tuple = ()                            # columns parsed as datetime64
+    finish: object = None                        # frame -> frame cast after parsing
+
+    def schema_key(self) -> str:
+        finish = getattr(self.finish, "__qualname__", None)
+        spec = repr((SIDECAR_FORMAT, sorted(self.dtypes.items()), list(self.dates), finish))
+        return hashlib.sha1(spec.encode()).hexdigest()[:8]
+
+
+DATASETS = {
+    "mobile_analytics": Dataset(
+        "data/mobile_analytics.csv", CSV_DTYPES, tuple(DATE_COLUMNS), compact_mobile_analytics,
+    ),
+    "advanced_dua": Dataset(
+        "data/advanced_dua.csv",
+        {
+            "dau": "int64", "total_sessions": "int64", "avg_session_duration": "float64",
+            "total_screens_viewed": "int64", "avg_screens_per_session": "float64",
+            "activity_level": "category",
+        },
+        ("date",),
+    ),
+    "advanced_retention": Dataset(
+        "data/advanced_retention.csv",
+        {
+            "total_users": "int64", "retained_users": "int64",
+            "df1_retained_users": "int64", "df2_retained_users": "int64", "df3_retained_users": "int64",
+            "df1_weekly_retention_rate": "float64", "df2_month1st_retention_rate": "float64",
+            "df3_month2nd_retention_rate": "float64", "retention_rate": "float64",
+            "churn_rate": "float64", "churn_rate_smooth": "float64",
+        },
+        ("first_date",),
+    ),
+}
+
+
+def parse_csv(dataset: Dataset, path) -> pd.DataFrame:
+    """Parse the CSV itself into the declared schema (no sidecar)"""
+    df = pd.read_csv(path, dtype=dataset.dtypes, parse_dates=list(dataset.dates))
+    return dataset.finish(df) if dataset.finish is not None else df
+
+
+def sidecar_path(dataset: Dataset, path) -> str:
+    st = os.stat(path)
+    source = os.path.abspath(path)
+    stem = f"{os.path.basename(source)}-{hashlib.sha1(source.encode()).hexdigest()[:8]}"
+    key = f"{st.st_mtime_ns}-{st.st_size}-{dataset.schema_key()}"
+    directory = DATA_CACHE_DIR or os.path.join(os.path.dirname(source), ".cache")
+    return os.path.join(directory, f"{stem}.{key}.arrow")
+
+
+def _write_sidecar(df, target):
+    import pyarrow.feather as feather
+
+    directory = os.path.dirname(target)
+    os.makedirs(directory, exist_ok=True)
+    with atomic_path(target) as tmp_path:  # readers never see a partial sidecar
+        feather.write_feather(df, tmp_path, compression="lz4")
+    stem = os.path.basename(target).rsplit(".", 2)[0]  # "<stem>.<key>.arrow"
+    for stale in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(stem)}.*.arrow")):
+        if stale != target:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+
+def read_dataset(name, path=None) -> pd.DataFrame:
+    """
+    Typed frame of a declared dataset (optionally from another copy at `path`),
+    served from its sidecar when the source file is unchanged.
+    """
+    dataset = DATASETS[name]
+    path = path or dataset.path
+    target = sidecar_path(dataset, path)
+    try:
+        import pyarrow.feather as feather
+        return feather.read_feather(target)
+    except (OSError, ValueError, ImportError):
+        pass  # missing, stale-format or corrupt sidecar: parse and rewrite it
+
+    df = parse_csv(dataset, path)
+    try:
+        _write_sidecar(df, target)
+    except (OSError, ImportError) as e:
+        # read-only data directory or no pyarrow: still serve the parsed frame
+        print(f" Could not write {name} sidecar: {e}")
+    return df
@@ -0,0 +1,93 @@
+# feature_encoder.py
+import json
+import numpy as np
+import pandas as pd
+
+from atomic_write import write_atomic
+
+# ====================================================
+# Fitted encoder: per-user aggregates -> model feature matrix
+# ====================================================
+# The model's one-hot columns are named "<dimension>_<level>" with the
+# baseline level dropped. The encoder keeps, per dimension, the matrix column
+# of every encoded level, and writes aggregates and indicator flags straight
+# into a preallocated float32 matrix in model.feature_names_in_ order.
+ENCODED_DIMENSIONS = ["device_type", "user_acquisition_channel", "user_segment"]
+
+
+class FeatureEncoder:
+    """
+    Maps aggregate frames (churn_model.aggregate_user_features output) to the
+    float32 feature matrix the churn forest was trained on. Baseline and
+    unseen levels encode as all zeros, like get_dummies(drop_first=True).
+    """
+
+    def __init__(self, feature_names, numeric_columns, level_columns, source_sha256=None):
+        self.feature_names = list(feature_names)
+        # {aggregate column: matrix column}
+        self.numeric_columns = dict(numeric_columns)
+        # {dimension: {level: matrix column}}
+        self.level_columns = {dim: dict(levels) for dim, levels in level_columns.items()}
+        # Fingerprint of the pickled model the encoder was fitted to
+        self.source_sha256 = source_sha256
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    # --------------- Fit / persist ------------------
+    @classmethod
+    def fit(cls, feature_names, dimensions=ENCODED_DIMENSIONS, source_sha256=None) -> "FeatureEncoder":
+        """Split the model's feature names into aggregate columns and dimension levels"""
+        numeric_columns, level_columns = {}, {dim: {} for dim in dimensions}
+        for index, name in enumerate(feature_names):
+            dim = next((d for d in dimensions if name.startswith(f"{d}_")), None)
+            if dim is None:
+                numeric_columns[name] = index
+            else:
+                level_columns[dim][name[len(dim) + 1:]] = index
+        return cls(feature_names, numeric_columns, level_columns, source_sha256)
+
+    def save(self, path):
+        write_atomic(path, json.dumps({
+            "feature_names": self.feature_names,
+            "numeric_columns": self.numeric_columns,
+            "level_columns": self.level_columns,
+            "source_sha256": self.source_sha256,
+        }, indent=2))
+
+    @classmethod
+    def load(cls, path) -> "FeatureEncoder":
+        with open(path) as f:
+            meta = json.load(f)
+        return cls(meta["feature_names"], meta["numeric_columns"], meta["level_columns"],
+                   meta.get("source_sha256"))
+
+    # --------------- Transform ------------------
+    def transform(self, agg_df: pd.DataFrame) -> np.ndarray:
+        """
+        Feature matrix of shape (n_users, n_features), float32, in model column
+        order. Dimensions are read from the `<dimension>_last` columns.
+        """
+        X = np.zeros((len(agg_df), self.n_features), dtype=np.float32)
+        for name, index in self.numeric_columns.items():
+            X[:, index] = agg_df[name].to_numpy(dtype=np.float32, na_value=np.nan)
+
+        rows = np.arange(len(agg_df))
+        for dim, levels in self.level_columns.items():
+            values = pd.Categorical(agg_df[f"{dim}_last"])
+            # matrix column per category, -1 for the baseline and unknown levels
+            lookup = np.array([levels.get(str(level), -1) for level in values.categories] + [-1], dtype=np.intp)
+            columns = lookup[values.codes]  # code -1 (missing) hits the trailing -1
+            hit = columns >= 0
+            X[rows[hit], columns[hit]] = 1.0
+        return X
+
+
+if __name__ == "__main__":
+    from churn_model import FEATURE_ENCODER_PATH, MODEL_PATH, get_model, file_sha256
+
+    print("🔧 Fitting feature encoder...")
+    encoder = FeatureEncoder.fit(get_model().feature_names_in_, source_sha256=file_sha256(MODEL_PATH))
+    encoder.save(FEATURE_ENCODER_PATH)
+    print(f"✅ {len(encoder.feature_names)} features saved to '{FEATURE_ENCODER_PATH}'")
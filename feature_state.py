@@ -0,0 +1,129 @@
+# feature_state.py
+import numpy as np
+import pandas as pd
+
+from churn_model import (
+    FEATURE_AGGREGATIONS,
+    NUMERIC_FEATURE_COLUMNS,
+    CATEGORICAL_FEATURE_COLUMNS,
+    encode_features,
+)
+
+# ====================================================
+# Mergeable per-user feature state
+# ====================================================
+# For every numeric column a user carries count, sum, centred sum of squares
+# (m2), min and max; these merge exactly across days/partitions and give
+# back mean, std, min, max and sum. Dimensions keep their last seen value.
+STATS = ["n", "sum", "m2", "min", "max"]
+
+
+class UserFeatureState:
+    """
+    Per-user sufficient statistics for the churn features.
+    Daily rescoring: load the state, update() it with the new day's rows,
+    save it and score state.to_features() - O(new rows), not O(history).
+    """
+
+    def __init__(self, stats: pd.DataFrame):
+        self.stats = stats
+
+    def __len__(self):
+        return len(self.stats)
+
+    # --------------- Building & merging ------------------
+    @classmethod
+    def from_frame(cls, raw_df: pd.DataFrame) -> "UserFeatureState":
+        """Summarise raw activity rows (mobile_analytics schema)"""
+        raw_df = raw_df.assign(**{
+            col: raw_df[col].astype("float64") for col in NUMERIC_FEATURE_COLUMNS
+        })
+        grouped = raw_df.groupby("user_id", observed=True, sort=True)
+
+        numeric = grouped[NUMERIC_FEATURE_COLUMNS].agg(["count", "sum", "var", "min", "max"])
+        stats = {}
+        for col in NUMERIC_FEATURE_COLUMNS:
+            n = numeric[(col, "count")]
+            stats[f"{col}_n"] = n.astype("float64")
+            stats[f"{col}_sum"] = numeric[(col, "sum")]
+            stats[f"{col}_m2"] = (numeric[(col, "var")] * (n - 1)).fillna(0.0)
+            stats[f"{col}_min"] = numeric[(col, "min")]
+            stats[f"{col}_max"] = numeric[(col, "max")]
+
+        stats["total_active_days"] = grouped["date"].count().astype("float64")
+        last = grouped[CATEGORICAL_FEATURE_COLUMNS].last()
+        for col in CATEGORICAL_FEATURE_COLUMNS:
+            stats[f"{col}_last"] = last[col].astype(object)
+
+        stats = pd.DataFrame(stats)
+        stats.index = stats.index.astype(str)
+        stats.index.name = "user_id"
+        return cls(stats)
+
+    def update(self, new_rows: pd.DataFrame) -> "UserFeatureState":
+        """Fold new activity rows (e.g. one day) into the state"""
+        return self.merge(UserFeatureState.from_frame(new_rows))
+
+    def merge(self, other: "UserFeatureState") -> "UserFeatureState":
+        """
+        Combine with a state built from later rows or another partition.
+        Per-column moments merge with Chan's parallel-variance formula;
+        `other`'s last values win where it has them.
+        """
+        a, b = self.stats.align(other.stats, join="outer")
+        merged = {}
+        for col in NUMERIC_FEATURE_COLUMNS:
+            na, nb = a[f"{col}_n"].fillna(0.0), b[f"{col}_n"].fillna(0.0)
+            sa, sb = a[f"{col}_sum"].fillna(0.0), b[f"{col}_sum"].fillna(0.0)
+            n = na + nb
+            delta = sb / nb - sa / na
+            cross = (delta ** 2 * na * nb / n).fillna(0.0)
+
+            merged[f"{col}_n"] = n
+            merged[f"{col}_sum"] = sa + sb
+            merged[f"{col}_m2"] = a[f"{col}_m2"].fillna(0.0) + b[f"{col}_m2"].fillna(0.0) + cross
+            merged[f"{col}_min"] = np.fmin(a[f"{col}_min"], b[f"{col}_min"])
+            merged[f"{col}_max"] = np.fmax(a[f"{col}_max"], b[f"{col}_max"])
+
+        merged["total_active_days"] = a["total_active_days"].fillna(0.0) + b["total_active_days"].fillna(0.0)
+        for col in CATEGORICAL_FEATURE_COLUMNS:
+            merged[f"{col}_last"] = b[f"{col}_last"].where(b[f"{col}_last"].notna(), a[f"{col}_last"])
+
+        return UserFeatureState(pd.DataFrame(merged, index=a.index))
+
+    # --------------- Features ------------------
+    def to_aggregates(self) -> pd.DataFrame:
+        """The per-user aggregate frame churn_model.aggregate_user_features produces"""
+        stats = self.stats.sort_index()
+        out = {"user_id": stats.index.to_numpy()}
+        for col, aggs in FEATURE_AGGREGATIONS.items():
+            if col not in NUMERIC_FEATURE_COLUMNS:
+                continue
+            n = stats[f"{col}_n"].to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = {
+                    "mean": np.where(n > 0, stats[f"{col}_sum"].to_numpy() / n, np.nan),
+                    "std": np.where(n > 1, np.sqrt(stats[f"{col}_m2"].to_numpy() / (n - 1)), np.nan),
+                    "min": stats[f"{col}_min"].to_numpy(),
+                    "max": stats[f"{col}_max"].to_numpy(),
+                    "sum": stats[f"{col}_sum"].to_numpy(),
+                }
+            for agg in aggs:
+                out[f"{col}_{agg}"] = values[agg]
+
+        out["total_active_days"] = stats["total_active_days"].to_numpy().astype("int64")
+        for col in CATEGORICAL_FEATURE_COLUMNS:
+            out[f"{col}_last"] = stats[f"{col}_last"].to_numpy()
+        return pd.DataFrame(out)
+
+    def to_features(self):
+        """Encoded float32 feature matrix in model.feature_names_in_ order, plus user_ids"""
+        return encode_features(self.to_aggregates())
+
+    # --------------- Persistence ------------------
+    def save(self, path):
+        self.stats.to_parquet(path)
+
+    @classmethod
+    def load(cls, path) -> "UserFeatureState":
+        return cls(pd.read_parquet(path))
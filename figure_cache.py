@@ -0,0 +1,83 @@
+# figure_cache.py
+import os
+import json
+import tempfile
+
+import plotly.io as pio
+
+from atomic_write import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process build lock, only atomic writes
+    fcntl = None
+
+# ====================================================
+# Cross-worker cache of serialized dashboard figures
+# ====================================================
+# One JSON file per (section, data version) in a directory every worker on
+# the host shares. Files are written to a temp name and renamed into place,
+# so readers never see a partial file; a per-key lock file makes one worker
+# build a section while the others wait and then read its result. A new data
+# version means new keys, and prune() drops the files of older versions.
+# get_or_build_json shares other per-version JSON results the same way (the
+# churn summary, see churn_cache.py). The default directory is per `scope`
+# (data_snapshot.source_scope of the sources), so deployments sharing a host
+# never prune each other's figures.
+FIGURE_CACHE_DIR = os.environ.get("FIGURE_CACHE_DIR")  # explicit override, used as is
+DEFAULT_CACHE_PREFIX = os.path.join(tempfile.gettempdir(), "mobile_app_analytics_figures")
+
+
+class FigureCache:
+    def __init__(self, directory=None, scope=None):
+        self.directory = directory or FIGURE_CACHE_DIR or f"{DEFAULT_CACHE_PREFIX}-{scope or 'default'}"
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, section, version, suffix=".json"):
+        return os.path.join(self.directory, f"{section}-{version}{suffix}")
+
+    def _read(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def get_or_build(self, section, version, build) -> list:
+        """
+        Figure dicts for `section` at `version`; `build()` returns plotly
+        figures and only runs on a miss (once across workers where fcntl exists).
+        """
+        return self.get_or_build_json(
+            section, version, lambda: "[" + ",".join(pio.to_json(fig, validate=False) for fig in build()) + "]"
+        )
+
+    def get_or_build_json(self, key, version, build):
+        """
+        Parsed JSON stored under `key` at `version`; `build()` returns the JSON
+        text and only runs on a miss (once across workers where fcntl exists).
+        """
+        path = self._path(key, version)
+        value = self._read(path)
+        if value is not None:
+            return value
+
+        with open(self._path(key, version, ".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            value = self._read(path)  # another worker may have built it meanwhile
+            if value is None:
+                payload = build()
+                write_atomic(path, payload)
+                value = json.loads(payload)
+        return value
+
+    def prune(self, keep_version):
+        """Delete cached sections of every other data version"""
+        for name in os.listdir(self.directory):
+            stem, ext = os.path.splitext(name)
+            if ext in (".json", ".lock") and not stem.endswith(f"-{keep_version}"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
@@ -1,16 +1,12 @@
 # metrics_extractor.py
-import pandas as pd
+from datasets import read_dataset
 
 print("📊 Extracting Key Metrics for Presentation...\n")
 
 # Load data
-dua_df = pd.read_csv("data/advanced_dua.csv")
-ret_df = pd.read_csv("data/advanced_retention.csv")
-mobile_df = pd.read_csv("data/mobile_analytics.csv")
-
-dua_df['date'] = pd.to_datetime(dua_df['date'])
-mobile_df['date'] = pd.to_datetime(mobile_df['date'])
-ret_df['first_date'] = pd.to_datetime(ret_df['first_date'])
+dua_df = read_dataset("advanced_dua")
+ret_df = read_dataset("advanced_retention")
+mobile_df = read_dataset("mobile_analytics")
 
 # Calculate key metrics
 print("=" * 60)
@@ -30,22 +26,22 @@ print(f"  • Average Churn Rate: {ret_df['churn_rate'].mean():.1f}%")
 print(f"  • Best Retention Period: {ret_df['retention_rate'].max():.1f}%")
 
 print("\n👥 USER SEGMENTS:")
-segment_stats = mobile_df.groupby('user_segment').agg({
+segment_stats = mobile_df.groupby('user_segment', observed=True).agg({
     'session_duration': 'mean',
     'screens_viewed': 'mean',
     'user_id': 'nunique'
-}).round(1)
+}).astype({'session_duration': 'float64'}).round(1)
 print(segment_stats)
 
 print("\n📱 DEVICE BREAKDOWN:")
-device_stats = mobile_df.groupby('device_type')['user_id'].nunique()
+device_stats = mobile_df.groupby('device_type', observed=True)['user_id'].nunique()
 print(device_stats)
 
 print("\n🎯 ACQUISITION CHANNELS:")
-channel_stats = mobile_df.groupby('user_acquisition_channel').agg({
+channel_stats = mobile_df.groupby('user_acquisition_channel', observed=True).agg({
     'session_duration': 'mean',
     'user_id': 'nunique'
-}).round(1)
+}).astype({'session_duration': 'float64'}).round(1)
 print(channel_stats)
 
 print("\n💡 GROWTH TRENDS:")
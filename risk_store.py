@@ -0,0 +1,191 @@
+# risk_store.py
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from churn_model import CATEGORICAL_FEATURE_COLUMNS, aggregate_user_features, score_aggregates
+
+# ====================================================
+# Indexed, persisted churn risk scores
+# ====================================================
+# One SQLite row per user, clustered on user_id. Every partition column has a
+# (partition, churn_probability DESC) index, so "top K riskiest in segment X"
+# walks an index range and stops after K rows, and point lookups hit the
+# primary key; neither scans or sorts the table.
+#
+# Full rescores (the dashboard's churn summary, predict_churn_chunked with
+# store=, rescore(..., replace=True)) write every row with one scored_at and
+# then delete users scored before it: users who left the data are dropped,
+# not served with stale scores.
+RISK_STORE_PATH = os.path.join(os.path.dirname(__file__), "data", "Deliverable", "risk_scores.sqlite")
+PARTITION_COLUMNS = ["risk_level", *CATEGORICAL_FEATURE_COLUMNS]
+STORE_COLUMNS = ["user_id", "churn_probability", "churn_prediction", *PARTITION_COLUMNS, "scored_at"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS risk_scores (
+    user_id TEXT PRIMARY KEY,
+    churn_probability REAL NOT NULL,
+    churn_prediction INTEGER NOT NULL,
+    risk_level TEXT,
+    device_type TEXT,
+    user_acquisition_channel TEXT,
+    user_segment TEXT,
+    scored_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_risk_probability ON risk_scores (churn_probability DESC);
+{"".join(
+    f"CREATE INDEX IF NOT EXISTS idx_risk_{col} ON risk_scores ({col}, churn_probability DESC);"
+    for col in PARTITION_COLUMNS
+)}
+"""
+
+
+class RiskScoreStore:
+    """
+    Persisted churn scores with point lookups by user_id and top-K queries
+    by churn_probability, optionally within risk_level / device_type /
+    user_acquisition_channel / user_segment partitions. Safe to share across
+    Dash worker threads (one connection per thread).
+    """
+
+    def __init__(self, path=RISK_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")  # readers don't block rescoring
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM risk_scores").fetchone()[0]
+
+    # --------------- Writes ------------------
+    @staticmethod
+    def timestamp() -> str:
+        """scored_at value for a rescore (ISO, microseconds, sorts by time)"""
+        return datetime.now().isoformat(timespec="microseconds")
+
+    def upsert(self, scores: pd.DataFrame, scored_at=None) -> int:
+        """
+        Insert or update score rows (user_id, churn_probability, churn_prediction,
+        risk_level and any partition columns present) in one transaction.
+        """
+        with self._connect() as conn:  # commits, or rolls back on error
+            return self._upsert(conn, scores, scored_at or self.timestamp())
+
+    def prune(self, scored_before) -> int:
+        """Delete users last scored before `scored_before`; returns how many"""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM risk_scores WHERE scored_at < ?", (scored_before,)).rowcount
+
+    def replace(self, scores: pd.DataFrame) -> int:
+        """Full rescore: upsert `scores` and delete every other user, in one transaction"""
+        scored_at = self.timestamp()
+        with self._connect() as conn:
+            written = self._upsert(conn, scores, scored_at)
+            conn.execute("DELETE FROM risk_scores WHERE scored_at < ?", (scored_at,))
+        return written
+
+    @staticmethod
+    def _upsert(conn, scores, scored_at):
+        rows = pd.DataFrame({
+            "user_id": scores["user_id"].astype(str),
+            "churn_probability": scores["churn_probability"].astype(float),
+            "churn_prediction": scores["churn_prediction"].astype(int),
+            **{
+                col: scores[col].astype(object).where(scores[col].notna(), None)
+                for col in PARTITION_COLUMNS if col in scores.columns
+            },
+        })
+        columns = [*rows.columns, "scored_at"]
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns[1:])
+        sql = (
+            f"INSERT INTO risk_scores ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(user_id) DO UPDATE SET {updates}"
+        )
+        conn.executemany(sql, ((*row, scored_at) for row in rows.itertuples(index=False, name=None)))
+        return len(rows)
+
+    def rescore(self, raw_df: pd.DataFrame, replace=False) -> pd.DataFrame:
+        """
+        predict_churn over raw activity rows, written back with each user's
+        partitions. replace=True (raw_df holds every user) also deletes users
+        absent from it.
+        """
+        return self._score_aggregates(aggregate_user_features(raw_df), replace)
+
+    def rescore_state(self, state, replace=False) -> pd.DataFrame:
+        """Same as rescore() from a feature_state.UserFeatureState"""
+        return self._score_aggregates(state.to_aggregates(), replace)
+
+    def _score_aggregates(self, agg_df, replace):
+        scores = score_aggregates(agg_df)
+        (self.replace if replace else self.upsert)(scores)
+        return scores
+
+    # --------------- Reads ------------------
+    def get(self, user_id):
+        """One user's stored score as a dict, or None"""
+        row = self._connect().execute(
+            f"SELECT {', '.join(STORE_COLUMNS)} FROM risk_scores WHERE user_id = ?", (str(user_id),)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_many(self, user_ids) -> pd.DataFrame:
+        user_ids = [str(user_id) for user_id in user_ids]
+        rows = []
+        conn = self._connect()
+        for start in range(0, len(user_ids), 500):  # stay under SQLite's bound-parameter limit
+            chunk = user_ids[start:start + 500]
+            rows += conn.execute(
+                f"SELECT {', '.join(STORE_COLUMNS)} FROM risk_scores "
+                f"WHERE user_id IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+        return pd.DataFrame([dict(row) for row in rows], columns=STORE_COLUMNS)
+
+    def top_k(self, k=500, **partitions) -> pd.DataFrame:
+        """
+        The `k` highest churn probabilities, optionally filtered by partition
+        values, e.g. top_k(500, user_segment="power_users").
+        """
+        unknown = set(partitions) - set(PARTITION_COLUMNS)
+        if unknown:
+            raise ValueError(f"unknown partition columns: {', '.join(sorted(unknown))}")
+        where = " AND ".join(f"{col} = ?" for col in partitions)
+        sql = (
+            f"SELECT {', '.join(STORE_COLUMNS)} FROM risk_scores"
+            f"{' WHERE ' + where if where else ''} "
+            f"ORDER BY churn_probability DESC, user_id LIMIT ?"
+        )
+        rows = self._connect().execute(sql, (*[str(v) for v in partitions.values()], int(k))).fetchall()
+        return pd.DataFrame([dict(row) for row in rows], columns=STORE_COLUMNS)
+
+    def counts(self, column="risk_level") -> pd.Series:
+        """Users per value of a partition column (index-only scan)"""
+        if column not in PARTITION_COLUMNS:
+            raise ValueError(f"unknown partition column: {column}")
+        rows = self._connect().execute(
+            f"SELECT {column}, COUNT(*) FROM risk_scores GROUP BY {column}"
+        ).fetchall()
+        return pd.Series({row[0]: row[1] for row in rows}, name="users")
+
+
+if __name__ == "__main__":
+    from datasets import read_dataset
+
+    print("🔍 Scoring users into the risk store...")
+    store = RiskScoreStore()
+    store.rescore(read_dataset("mobile_analytics"), replace=True)
+    print(f"✅ {len(store):,} users stored in '{store.path}'")
+    print(store.counts("risk_level"))
+    print(store.top_k(5, user_segment="power_users"))
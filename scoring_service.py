@@ -0,0 +1,206 @@
+# scoring_service.py
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError
+
+import numpy as np
+import pandas as pd
+
+from analytics_schema import compact_mobile_analytics
+from churn_model import FEATURE_AGGREGATIONS, NUMERIC_FEATURE_COLUMNS, predict_churn
+
+# ====================================================
+# Online churn scoring with request micro-batching
+# ====================================================
+# Request threads only parse and validate their rows, then hand them to one
+# batcher thread. The batcher waits up to BATCH_WINDOW_MS for more requests
+# and runs the usual predict_churn pipeline (compact schema, aggregation,
+# encoding, compiled forest) once for the whole batch. Users are keyed by
+# request inside a batch, so the same user_id in two requests never merges.
+# Failures come back as JSON too: 400 for bad rows, 503 when scoring takes
+# longer than SCORE_TIMEOUT_SECONDS, 500 for anything else; every request,
+# failed or not, is counted in the latency window.
+BATCH_WINDOW_MS = 5
+MAX_BATCH_REQUESTS = 256
+SCORE_TIMEOUT_SECONDS = 10.0
+LATENCY_WINDOW = 10_000
+RESPONSE_COLUMNS = ["user_id", "churn_probability", "churn_prediction", "risk_level"]
+REQUIRED_COLUMNS = ["user_id", *FEATURE_AGGREGATIONS]
+
+
+class LatencyTracker:
+    """Rolling window of request latencies with p50/p99, failed requests included"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+
+    def record(self, seconds, failed=False):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.errors += failed
+
+    def summary(self) -> dict:
+        with self._lock:
+            samples = np.array(self._samples)
+            count, errors = self.count, self.errors
+        if not len(samples):
+            return {"requests": count, "errors": errors, "p50_ms": None, "p99_ms": None}
+        p50, p99 = np.percentile(samples, [50, 99]) * 1000
+        return {"requests": count, "errors": errors, "window": len(samples),
+                "p50_ms": round(p50, 3), "p99_ms": round(p99, 3)}
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring requests into one forest evaluation.
+    submit() takes a frame of raw activity rows and returns a Future that
+    resolves to that request's score rows (one per user, sorted by user_id).
+    """
+
+    def __init__(self, window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH_REQUESTS):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_requests = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, raw_df: pd.DataFrame) -> Future:
+        self._ensure_thread()
+        future = Future()
+        self._queue.put((raw_df, future))
+        return future
+
+    def _ensure_thread(self):
+        # Started on first use, so forked server workers each get their own
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="churn-batcher", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                # after the window, still take whatever already queued up
+                remaining = max(deadline - time.perf_counter(), 0)
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._score_batch(batch)
+
+    def _score_batch(self, batch):
+        try:
+            request_ids = np.repeat(np.arange(len(batch)), [len(raw_df) for raw_df, _ in batch])
+            raw_df = pd.concat([raw_df for raw_df, _ in batch], ignore_index=True)
+            # zero-padded request prefix keeps predict_churn's sorted output request-major
+            prefixes = pd.Series(request_ids).map("{:06d}|".format)
+            raw_df["user_id"] = prefixes + raw_df["user_id"].astype(str)
+
+            scores = predict_churn(compact_mobile_analytics(raw_df))[RESPONSE_COLUMNS]
+            keys = scores["user_id"].astype(str).str.split("|", n=1, expand=True)
+            scores["user_id"] = keys[1].to_numpy()
+            bounds = np.searchsorted(keys[0].astype(int).to_numpy(), np.arange(len(batch) + 1))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.batched_requests += len(batch)
+        for i, (_, future) in enumerate(batch):
+            future.set_result(scores.iloc[bounds[i]:bounds[i + 1]].reset_index(drop=True))
+
+    def summary(self) -> dict:
+        return {
+            "batches": self.batches,
+            "avg_requests_per_batch": round(self.batched_requests / self.batches, 2) if self.batches else None,
+            "window_ms": self.window * 1000,
+        }
+
+
+batcher = MicroBatcher()
+latency = LatencyTracker()
+
+
+def rows_to_frame(rows) -> pd.DataFrame:
+    """Raw activity rows (list of dicts) -> DataFrame; ValueError on bad input"""
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("expected a non-empty list of activity rows")
+    raw_df = pd.DataFrame.from_records(rows)
+    missing = [col for col in REQUIRED_COLUMNS if col not in raw_df.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    if raw_df["user_id"].isna().any():
+        raise ValueError("every row needs a user_id")
+
+    # Coerce here so one malformed request cannot fail a whole batch
+    raw_df = raw_df[REQUIRED_COLUMNS].copy()
+    for col in NUMERIC_FEATURE_COLUMNS:
+        raw_df[col] = pd.to_numeric(raw_df[col])
+    raw_df["date"] = pd.to_datetime(raw_df["date"])
+    return raw_df
+
+
+def score_rows(rows, timeout=SCORE_TIMEOUT_SECONDS) -> pd.DataFrame:
+    """Score raw activity rows through the shared micro-batcher"""
+    return batcher.submit(rows_to_frame(rows)).result(timeout=timeout)
+
+
+def score_payload(payload):
+    """(JSON body, HTTP status) answering one scoring request"""
+    rows = payload.get("rows") if isinstance(payload, dict) else payload
+    try:
+        raw_df = rows_to_frame(rows)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    try:
+        scores = batcher.submit(raw_df).result(timeout=SCORE_TIMEOUT_SECONDS)
+    except TimeoutError:
+        return {"error": f"scoring took longer than {SCORE_TIMEOUT_SECONDS:g} s, retry shortly"}, 503
+    except Exception as e:
+        # model load failure, bad artifact, ...: still a JSON answer
+        print(f" Churn scoring failed: {e!r}")
+        return {"error": f"scoring failed: {e}"}, 500
+
+    scores = scores.assign(
+        churn_probability=scores["churn_probability"].astype(float),
+        churn_prediction=scores["churn_prediction"].astype(int),
+        risk_level=scores["risk_level"].astype(str),
+    )
+    return {"predictions": scores.to_dict(orient="records")}, 200
+
+
+def register_scoring_routes(server, prefix="/api/churn"):
+    """
+    Add the scoring endpoints to a Flask server:
+      POST {prefix}/score   body: {"rows": [activity rows]} (or a bare list)
+      GET  {prefix}/latency p50/p99 request latency and batching stats
+    """
+    from flask import jsonify, request
+
+    @server.route(f"{prefix}/score", methods=["POST"])
+    def churn_score():
+        t0 = time.perf_counter()
+        body, status = score_payload(request.get_json(silent=True))
+        elapsed = time.perf_counter() - t0
+        latency.record(elapsed, failed=status != 200)
+        body["latency_ms"] = round(elapsed * 1000, 3)
+        headers = {"Retry-After": "1"} if status == 503 else {}
+        return jsonify(body), status, headers
+
+    @server.route(f"{prefix}/latency", methods=["GET"])
+    def churn_latency():
+        return jsonify({**latency.summary(), **batcher.summary()})
+
+    return server
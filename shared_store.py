@@ -0,0 +1,129 @@
+# shared_store.py
+import os
+import json
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from atomic_write import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows: publishing is still atomic, just not serialised
+    fcntl = None
+
+# ====================================================
+# Memory-mapped columnar data store shared by all workers
+# ====================================================
+# Each published version is a directory of frames, one .npy file per column
+# (categoricals as their codes), plus meta.json. Workers open columns with
+# np.load(mmap_mode="r"), so every process maps the same page-cache pages
+# instead of holding its own parsed copy. A GENERATION file ("<n> <version>")
+# is bumped atomically after each publish; workers compare it with the
+# generation they serve and re-attach when it moved.
+#
+# The default directory is per `scope` (data_snapshot.source_scope of the
+# sources), so two deployments on one host never share a generation counter.
+DATA_STORE_DIR = os.environ.get("DATA_STORE_DIR")  # explicit override, used as is
+DEFAULT_STORE_PREFIX = os.path.join(tempfile.gettempdir(), "mobile_app_analytics_store")
+GENERATION_FILE = "GENERATION"
+KEEP_VERSIONS = 2  # the current one plus the one readers may still be leaving
+
+
+class SharedDataStore:
+    """
+    Publishes {name: DataFrame} snapshots as memory-mapped column files.
+    Frames are stored by column (the index is not kept); object columns
+    come back as categoricals so they can be mapped too.
+    """
+
+    def __init__(self, directory=None, scope=None):
+        self.directory = directory or DATA_STORE_DIR or f"{DEFAULT_STORE_PREFIX}-{scope or 'default'}"
+        os.makedirs(self.directory, exist_ok=True)
+
+    # --------------- Generation counter ------------------
+    def generation(self):
+        """(generation, version) last published, (0, None) before the first publish"""
+        try:
+            with open(os.path.join(self.directory, GENERATION_FILE)) as f:
+                number, version = f.read().split()
+            return int(number), version
+        except (FileNotFoundError, ValueError):
+            return 0, None
+
+    def fingerprints(self, version):
+        with open(os.path.join(self.directory, version, "meta.json")) as f:
+            return {name: tuple(fp) for name, fp in json.load(f)["fingerprints"].items()}
+
+    @contextmanager
+    def publish_lock(self):
+        """Serialises load-and-publish across the workers on this host"""
+        with open(os.path.join(self.directory, ".publish.lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    # --------------- Write ------------------
+    def publish(self, version, fingerprints, frames) -> int:
+        """Write `frames` under `version` and make it the current generation"""
+        target = os.path.join(self.directory, version)
+        if not os.path.exists(os.path.join(target, "meta.json")):
+            staging = tempfile.mkdtemp(dir=self.directory, prefix=f".{version}-")
+            meta = {"fingerprints": fingerprints, "frames": {}}
+            for name, df in frames.items():
+                os.makedirs(os.path.join(staging, name))
+                meta["frames"][name] = [
+                    self._write_column(os.path.join(staging, name, f"{i}.npy"), col, df[col])
+                    for i, col in enumerate(df.columns)
+                ]
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            shutil.rmtree(target, ignore_errors=True)
+            os.rename(staging, target)  # the version appears complete or not at all
+
+        number = self.generation()[0] + 1
+        write_atomic(os.path.join(self.directory, GENERATION_FILE), f"{number} {version}")
+        self._prune(keep=version)
+        return number
+
+    @staticmethod
+    def _write_column(path, name, values):
+        if values.dtype == object:
+            values = values.astype("category")
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            np.save(path, values.cat.codes.to_numpy())
+            return {"name": name, "categories": values.cat.categories.tolist(), "ordered": bool(values.cat.ordered)}
+        np.save(path, values.to_numpy())
+        return {"name": name}
+
+    def _prune(self, keep):
+        versions = [
+            entry for entry in os.scandir(self.directory)
+            if entry.is_dir() and not entry.name.startswith(".") and entry.name != keep
+        ]
+        versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in versions[KEEP_VERSIONS - 1:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    # --------------- Read ------------------
+    def open(self, version) -> dict:
+        """Zero-copy {name: DataFrame} view of a published version (read-only)"""
+        root = os.path.join(self.directory, version)
+        with open(os.path.join(root, "meta.json")) as f:
+            meta = json.load(f)
+
+        frames = {}
+        for name, columns in meta["frames"].items():
+            data = {}
+            for i, column in enumerate(columns):
+                # plain ndarray view of the mapping, so pandas results aren't memmaps
+                values = np.load(os.path.join(root, name, f"{i}.npy"), mmap_mode="r").view(np.ndarray)
+                if "categories" in column:
+                    values = pd.Categorical.from_codes(values, categories=column["categories"],
+                                                       ordered=column["ordered"])
+                data[column["name"]] = values
+            frames[name] = pd.DataFrame(data, copy=False)
+        return frames
@@ -1,9 +1,16 @@
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import random
 from faker import Faker
-import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics_schema import compact_mobile_analytics
 
 class MobileAnalyticsGenerator:
     def __init__(self, seed=42):
@@ -41,139 +48,196 @@ class MobileAnalyticsGenerator:
             'email': 0.05,
             'direct': 0.05
         }
+        
+        # Age groups
+        self.age_groups = {
+            '18-24': 0.25,
+            '25-34': 0.35,
+            '35-44': 0.25,
+            '45-54': 0.10,
+            '55+': 0.05
+        }
+        
+        # Countries are drawn from a pool of pre-sampled Faker country codes
+        self.country_pool_size = 1024
+        self._countries = None
+        
+        # Daily activity model per segment (weekend boost skips churned users)
+        self.activity_probs = {
+            'power_users': 0.85,
+            'regular_users': 0.45,
+            'casual_users': 0.15,
+            'churned_users': 0.02
+        }
+        self.weekend_multipliers = {
+            'power_users': 1.3,
+            'regular_users': 1.3,
+            'casual_users': 1.3,
+            'churned_users': 1.0
+        }
+        
+        # Sessions per active day are 1 + Poisson(rate), capped at max_sessions
+        self.session_rates = {
+            'power_users': 4,
+            'regular_users': 2,
+            'casual_users': 1,
+            'churned_users': 0
+        }
+        self.max_sessions = 8
+        
+        # Session duration ranges by segment (minutes)
+        self.duration_ranges = {
+            'power_users': (8, 45),
+            'regular_users': (3, 20),
+            'casual_users': (1, 8),
+            'churned_users': (0.5, 3)
+        }
+        
+        # Random stream used by the vectorized engine; shards derive theirs from the seed
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
     
     def generate_users(self, num_users=50000):
-        """Generate user base with realistic characteristics"""
-        users = []
-        
-        for i in range(num_users):
-            # Determine user segment
-            segment_rand = random.random()
-            if segment_rand < 0.15:
-                segment = 'power_users'
-            elif segment_rand < 0.50:
-                segment = 'regular_users'
-            elif segment_rand < 0.85:
-                segment = 'casual_users'
-            else:
-                segment = 'churned_users'
-            
-            # Generate user characteristics based on segment
-            user = {
-                'user_id': f"user_{str(uuid.uuid4())[:8]}",
-                'segment': segment,
-                'device_type': np.random.choice(
-                    list(self.device_distribution.keys()),
-                    p=list(self.device_distribution.values())
-                ),
-                'acquisition_channel': np.random.choice(
-                    list(self.acquisition_channels.keys()),
-                    p=list(self.acquisition_channels.values())
-                ),
-                'install_date': self.fake.date_between(
-                    start_date='-365d', end_date='-30d'
-                ),
-                'country': self.fake.country_code(),
-                'age_group': np.random.choice(
-                    ['18-24', '25-34', '35-44', '45-54', '55+'],
-                    p=[0.25, 0.35, 0.25, 0.10, 0.05]
-                )
-            }
-            users.append(user)
+        """Generate user base with realistic characteristics
         
-        return pd.DataFrame(users)
+        All attributes are drawn as vectorized arrays in one shot; countries
+        come from a pool pre-sampled once from Faker.
+        """
+        segments = self._draw_categories(self.user_segments, num_users)
+        devices = self._draw_categories(self.device_distribution, num_users)
+        channels = self._draw_categories(self.acquisition_channels, num_users)
+        age_groups = self._draw_categories(self.age_groups, num_users)
+        
+        # Install dates uniformly between 365 and 30 days ago
+        today = np.datetime64(datetime.now().date(), 'D')
+        install_dates = today - self.rng.integers(30, 366, size=num_users)
+        
+        countries = self._country_pool()[self.rng.integers(0, self.country_pool_size, size=num_users)]
+        
+        return pd.DataFrame({
+            'user_id': self._generate_user_ids(num_users),
+            'segment': segments,
+            'device_type': devices,
+            'acquisition_channel': channels,
+            'install_date': install_dates,
+            'country': countries,
+            'age_group': age_groups
+        })
+    
+    def _draw_categories(self, distribution, size):
+        """Draw ``size`` labels from a {label: probability} dict"""
+        labels = np.array(list(distribution.keys()), dtype=object)
+        return labels[self.rng.choice(len(labels), size=size, p=list(distribution.values()))]
+    
+    def _country_pool(self):
+        """Country codes pre-sampled from Faker, built on first use"""
+        if self._countries is None:
+            self._countries = np.array(
+                [self.fake.country_code() for _ in range(self.country_pool_size)], dtype=object
+            )
+        return self._countries
+    
+    def _generate_user_ids(self, num_users):
+        """Unique ``user_<8 hex digits>`` ids from distinct random 32-bit integers"""
+        ids = self.rng.choice(2**32, size=num_users, replace=False).astype(np.uint32)
+        
+        # Spell out the 8 hex nibbles of every id and prepend the prefix bytes
+        nibbles = (ids[:, None] >> np.arange(28, -4, -4, dtype=np.uint32)) & 0xF
+        hex_digits = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)[nibbles]
+        prefix = np.broadcast_to(np.frombuffer(b'user_', dtype=np.uint8), (num_users, 5))
+        raw = np.ascontiguousarray(np.hstack([prefix, hex_digits]))
+        return raw.view('S13').ravel().astype(str).astype(object)
     
     def generate_daily_activities(self, users_df, start_date, end_date):
-        """Generate daily user activities"""
-        activities = []
+        """Generate daily user activities with the vectorized activity engine"""
+        segment_codes, install_days = self._user_arrays(users_df)
         
         # Convert dates
         start = datetime.strptime(start_date, '%Y-%m-%d')
         end = datetime.strptime(end_date, '%Y-%m-%d')
+        dates = pd.date_range(start, end)
         
-        for current_date in pd.date_range(start, end):
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            # Weekend effect (higher usage on weekends)
-            is_weekend = current_date.weekday() >= 5
-            weekend_multiplier = 1.3 if is_weekend else 1.0
-            
-            for _, user in users_df.iterrows():
-                # Determine if user is active today based on segment
-                segment = user['segment']
-                
-                # Activity probability by segment
-                activity_probs = {
-                    'power_users': 0.85 * weekend_multiplier,
-                    'regular_users': 0.45 * weekend_multiplier,
-                    'casual_users': 0.15 * weekend_multiplier,
-                    'churned_users': 0.02
-                }
-                
-                # Check if user installed app before this date
-                install_date = pd.to_datetime(user['install_date'])
-                if current_date < install_date:
-                    continue
-                
-                # Days since install affects retention
-                days_since_install = (current_date - install_date).days
-                retention_decay = max(0.1, 1 - (days_since_install * 0.002))
-                
-                final_activity_prob = activity_probs[segment] * retention_decay
-                
-                if random.random() < final_activity_prob:
-                    # User is active today - generate session data
-                    session_data = self._generate_session_data(user, date_str, segment)
-                    activities.extend(session_data)
-        
-        return pd.DataFrame(activities)
-    
-    def _generate_session_data(self, user, date_str, segment):
-        """Generate session data for an active user"""
-        sessions = []
+        user_idx, day_idx, sessions = [], [], []
+        for i, current_date in enumerate(dates):
+            active, session_data = self._simulate_day(segment_codes, install_days, current_date)
+            user_idx.append(active[session_data['owner']])
+            day_idx.append(np.full(len(session_data['owner']), i))
+            sessions.append(session_data)
+        
+        user_idx = np.concatenate(user_idx)
+        day_idx = np.concatenate(day_idx)
+        
+        return pd.DataFrame({
+            'user_id': users_df['user_id'].to_numpy()[user_idx],
+            'date': dates.strftime('%Y-%m-%d').to_numpy()[day_idx],
+            'session_duration': np.concatenate([s['session_duration'] for s in sessions]),
+            'screens_viewed': np.concatenate([s['screens_viewed'] for s in sessions]),
+            'app_opens': np.concatenate([s['app_opens'] for s in sessions]),
+            'device_type': users_df['device_type'].to_numpy()[user_idx],
+            'user_acquisition_channel': users_df['acquisition_channel'].to_numpy()[user_idx],
+            'user_segment': users_df['segment'].to_numpy()[user_idx]
+        })
+    
+    def _user_arrays(self, users_df):
+        """Encode segments and install dates once for the activity engine"""
+        segment_codes = pd.Categorical(
+            users_df['segment'], categories=list(self.user_segments)
+        ).codes.astype(np.int64)
+        install_days = pd.to_datetime(users_df['install_date']).to_numpy().astype('datetime64[D]')
+        return segment_codes, install_days
+    
+    def _segment_table(self, values):
+        """Lay out a per-segment parameter dict as an array indexed by segment code"""
+        return np.array([values[segment] for segment in self.user_segments])
+    
+    def _simulate_day(self, segment_codes, install_days, current_date):
+        """Draw which users are active on one date and their sessions"""
+        # Weekend effect (higher usage on weekends)
+        activity_probs = self._segment_table(self.activity_probs)
+        if current_date.weekday() >= 5:
+            activity_probs = activity_probs * self._segment_table(self.weekend_multipliers)
         
+        # Only users who installed the app by this date can be active
+        days_since_install = (np.datetime64(current_date, 'D') - install_days).astype(np.int64)
+        eligible = days_since_install >= 0
+        
+        # Days since install affects retention
+        retention_decay = np.maximum(0.1, 1 - days_since_install * 0.002)
+        final_activity_prob = activity_probs[segment_codes] * retention_decay
+        
+        draws = self.rng.random(len(segment_codes))
+        active = np.flatnonzero(eligible & (draws < final_activity_prob))
+        return active, self._generate_session_data(segment_codes[active])
+    
+    def _generate_session_data(self, segment_codes):
+        """Generate columnar session arrays for a batch of active users
+        
+        ``owner`` maps every session back to its position in ``segment_codes``.
+        """
         # Number of sessions per day by segment
-        session_counts = {
-            'power_users': np.random.poisson(4) + 1,
-            'regular_users': np.random.poisson(2) + 1,
-            'casual_users': np.random.poisson(1) + 1,
-            'churned_users': 1
-        }
+        rates = self._segment_table(self.session_rates)[segment_codes]
+        num_sessions = np.minimum(self.rng.poisson(rates) + 1, self.max_sessions)
+        owner = np.repeat(np.arange(len(segment_codes)), num_sessions)
         
-        num_sessions = min(session_counts[segment], 8)  # Cap at 8 sessions
+        # Session duration varies by segment (minutes)
+        ranges = self._segment_table(self.duration_ranges)[segment_codes[owner]]
+        session_duration = self.rng.uniform(ranges[:, 0], ranges[:, 1])
         
-        for session in range(num_sessions):
-            # Session duration varies by segment (minutes)
-            duration_ranges = {
-                'power_users': (8, 45),
-                'regular_users': (3, 20),
-                'casual_users': (1, 8),
-                'churned_users': (0.5, 3)
-            }
-            
-            min_dur, max_dur = duration_ranges[segment]
-            session_duration = np.random.uniform(min_dur, max_dur)
-            
-            # Screens viewed correlates with session duration
-            screens_viewed = max(1, int(session_duration / 2) + np.random.poisson(1))
-            
-            # App opens (first session of day counts as app open)
-            app_opens = 1 if session == 0 else 0
-            
-            session_data = {
-                'user_id': user['user_id'],
-                'date': date_str,
-                'session_duration': round(session_duration, 2),
-                'screens_viewed': screens_viewed,
-                'app_opens': app_opens,
-                'device_type': user['device_type'],
-                'user_acquisition_channel': user['acquisition_channel'],
-                'user_segment': segment
-            }
-            
-            sessions.append(session_data)
+        # Screens viewed correlates with session duration
+        screens_viewed = np.maximum(
+            1, (session_duration / 2).astype(np.int64) + self.rng.poisson(1, size=len(owner))
+        )
+        
+        # App opens (first session of day counts as app open)
+        app_opens = np.zeros(len(owner), dtype=np.int64)
+        app_opens[np.cumsum(num_sessions) - num_sessions] = 1
         
-        return sessions
+        return {
+            'owner': owner,
+            'session_duration': np.round(session_duration, 2),
+            'screens_viewed': screens_viewed,
+            'app_opens': app_opens
+        }
     
     def calculate_metrics(self, activities_df, users_df):
         """Calculate key metrics and add to dataset"""
@@ -206,40 +270,38 @@ class MobileAnalyticsGenerator:
         return daily_user_data
     
     def _calculate_retention(self, activities_df, users_df):
-        """Calculate retention rates by date"""
-        retention_rates = []
+        """Calculate retention rates by date
         
-        # Get unique dates
-        dates = sorted(activities_df['date'].unique())
+        Active users per date come from one grouped pass over the activities;
+        eligible users per date come from the sorted install-date index.
+        """
+        active_users = activities_df.groupby('date')['user_id'].nunique()
+        _, install_days = self._user_arrays(users_df)
+        eligible_users = self._eligible_user_counts(install_days, active_users.index)
         
-        for date in dates:
-            current_date = pd.to_datetime(date)
-            
-            # Users who could be active (installed before this date)
-            eligible_users = users_df[
-                pd.to_datetime(users_df['install_date']) <= current_date
-            ]
-            
-            # Users who were actually active
-            active_users = activities_df[
-                activities_df['date'] == date
-            ]['user_id'].unique()
-            
-            # Calculate retention
-            if len(eligible_users) > 0:
-                retention_rate = (len(active_users) / len(eligible_users)) * 100
-            else:
-                retention_rate = 0
-                
-            retention_rates.append({
-                'date': date,
-                'retention_rate': round(retention_rate, 2)
-            })
-        
-        return pd.DataFrame(retention_rates)
-    
-    def generate_complete_dataset(self, num_users=50000, days=90):
-        """Generate complete realistic mobile analytics dataset"""
+        return pd.DataFrame({
+            'date': active_users.index,
+            'retention_rate': self._retention_rates(active_users.to_numpy(), eligible_users)
+        })
+    
+    def _eligible_user_counts(self, install_days, dates):
+        """Users installed on or before each date, via binary search over sorted install days"""
+        dates = pd.to_datetime(dates).to_numpy().astype('datetime64[D]')
+        return np.searchsorted(np.sort(install_days), dates, side='right')
+    
+    def _retention_rates(self, active_users, eligible_users):
+        """Percentage of eligible users active on each date, rounded to 2 places"""
+        return [
+            round((active / eligible) * 100, 2) if eligible > 0 else 0
+            for active, eligible in zip(np.asarray(active_users).tolist(), np.asarray(eligible_users).tolist())
+        ]
+    
+    def generate_complete_dataset(self, num_users=50000, days=90, state_dir=None):
+        """Generate complete realistic mobile analytics dataset
+        
+        With ``state_dir`` the generator state is saved so ``append_days``
+        can extend the dataset later.
+        """
         print(f"Generating dataset for {num_users:,} users over {days} days...")
         
         # Generate users
@@ -261,6 +323,12 @@ class MobileAnalyticsGenerator:
         # Add some realistic noise and edge cases
         final_dataset = self._add_realistic_variations(final_dataset)
         
+        # Store with the compact dtype schema
+        final_dataset = compact_mobile_analytics(final_dataset)
+        
+        if state_dir:
+            self._save_dataset_state(state_dir, users_df, final_dataset, end_date)
+        
         print(f"✅ Dataset generated: {len(final_dataset):,} records")
         print(f"📊 Date range: {final_dataset['date'].min()} to {final_dataset['date'].max()}")
         print(f"👥 Unique users: {final_dataset['user_id'].nunique():,}")
@@ -268,10 +336,246 @@ class MobileAnalyticsGenerator:
         
         return final_dataset
     
+    def generate_streaming_dataset(self, output_dir, num_users=50000, days=90, block_days=7):
+        """Generate the dataset block by block into date-partitioned Parquet files
+        
+        Writes one ``activity/<date>.parquet`` per day, a ``daily_metrics.parquet``
+        summary and the generator state (see ``save_state``). Only one block of
+        days is held in memory; DAU and retention are tracked as running
+        per-date state.
+        """
+        print(f"Streaming dataset for {num_users:,} users over {days} days to '{output_dir}'...")
+        
+        print("1. Generating user base...")
+        users_df = self.generate_users(num_users)
+        
+        # Generate date range (last N days)
+        end = datetime.strptime(datetime.now().strftime('%Y-%m-%d'), '%Y-%m-%d')
+        dates = pd.date_range(end - timedelta(days=days), end)
+        
+        print("2. Generating daily activities...")
+        daily_metrics, last_active = self._stream_days(users_df, dates, output_dir, block_days)
+        daily_metrics.to_parquet(os.path.join(output_dir, 'daily_metrics.parquet'), index=False)
+        self.save_state(output_dir, users_df.assign(last_active_date=last_active), dates[-1])
+        
+        print(f"✅ Dataset streamed: {daily_metrics['daily_active_users'].sum():,} records in {len(dates)} partitions")
+        return daily_metrics
+    
+    def append_days(self, dataset_path, state_dir, days=1, block_days=7):
+        """Generate only the next ``days`` days after a saved state and append them
+        
+        ``dataset_path`` is either a streamed dataset directory (new date
+        partitions and daily metrics are added) or a CSV file (rows are
+        appended). History is never regenerated; the state is advanced.
+        """
+        users_df, last_date = self.load_state(state_dir)
+        dates = pd.date_range(last_date + timedelta(days=1), periods=days)
+        print(f"Appending {days} days ({dates[0]:%Y-%m-%d} to {dates[-1]:%Y-%m-%d}) to '{dataset_path}'...")
+        
+        if os.path.isdir(dataset_path):
+            daily_metrics, last_active = self._stream_days(
+                users_df, dates, dataset_path, block_days, users_df['last_active_date']
+            )
+            metrics_path = os.path.join(dataset_path, 'daily_metrics.parquet')
+            pd.concat([pd.read_parquet(metrics_path), daily_metrics], ignore_index=True).to_parquet(
+                metrics_path, index=False
+            )
+        else:
+            daily_metrics, last_active = self._stream_days(
+                users_df, dates, None, len(dates), users_df['last_active_date'],
+                on_block=lambda block_df: block_df.to_csv(dataset_path, mode='a', header=False, index=False)
+            )
+        
+        self.save_state(state_dir, users_df.assign(last_active_date=last_active), dates[-1])
+        print(f"✅ Appended {daily_metrics['daily_active_users'].sum():,} records")
+        return daily_metrics
+    
+    def save_state(self, state_dir, users_df, last_date):
+        """Persist the RNG state and per-user state needed to append more days
+        
+        ``users_df`` is the user table with a ``last_active_date`` column.
+        """
+        os.makedirs(state_dir, exist_ok=True)
+        users_df.to_parquet(os.path.join(state_dir, 'users.parquet'), index=False)
+        state = {
+            'seed': self.seed,
+            'last_date': pd.Timestamp(last_date).strftime('%Y-%m-%d'),
+            'rng_state': self.rng.bit_generator.state
+        }
+        with open(os.path.join(state_dir, 'generator_state.json'), 'w') as f:
+            json.dump(state, f)
+    
+    def _save_dataset_state(self, state_dir, users_df, dataset, last_date):
+        """Save state for an in-memory dataset, deriving each user's last active date"""
+        last_active = dataset.groupby('user_id', observed=True)['date'].max()
+        self.save_state(
+            state_dir,
+            users_df.assign(last_active_date=users_df['user_id'].map(last_active).to_numpy()),
+            last_date
+        )
+    
+    def load_state(self, state_dir):
+        """Restore the RNG from a saved state; returns (users_df, last_date)"""
+        with open(os.path.join(state_dir, 'generator_state.json')) as f:
+            state = json.load(f)
+        self.seed = state['seed']
+        self.rng.bit_generator.state = state['rng_state']
+        users_df = pd.read_parquet(os.path.join(state_dir, 'users.parquet'))
+        return users_df, datetime.strptime(state['last_date'], '%Y-%m-%d')
+    
+    def _stream_days(self, users_df, dates, output_dir, block_days, last_active=None, on_block=None):
+        """Simulate ``dates`` block by block, handing each finished block to a writer
+        
+        Blocks go to ``on_block`` or, by default, to date partitions under
+        ``output_dir/activity``. Returns the per-date metrics and every user's
+        last active date.
+        """
+        if on_block is None:
+            activity_dir = os.path.join(output_dir, 'activity')
+            os.makedirs(activity_dir, exist_ok=True)
+            
+            def on_block(block_df):
+                for date, day_df in block_df.groupby('date', sort=False):
+                    day_df.to_parquet(os.path.join(activity_dir, f"{date:%Y-%m-%d}.parquet"), index=False)
+        
+        if last_active is None:
+            last_active = np.full(len(users_df), np.datetime64('NaT'), dtype='datetime64[D]')
+        else:
+            last_active = pd.to_datetime(last_active).to_numpy().astype('datetime64[D]')
+        
+        daily_metrics, block = [], []
+        for i, (metrics, active, day_df) in enumerate(self._iter_days(users_df, dates)):
+            daily_metrics.append(metrics)
+            last_active[active] = np.datetime64(metrics['date'], 'D')
+            if not block:
+                block_start = metrics['date']
+            block.append(day_df)
+            
+            if len(block) == block_days or i == len(dates) - 1:
+                # Variations are sampled per block so memory stays bounded
+                block_df = compact_mobile_analytics(
+                    self._add_realistic_variations(pd.concat(block, ignore_index=True))
+                )
+                on_block(block_df)
+                print(f"   {block_start}: {len(block_df):,} records written")
+                block = []
+        
+        return pd.DataFrame(daily_metrics), last_active
+    
+    def _iter_days(self, users_df, dates):
+        """Yield (metrics, active positions, per-user rows) for each date
+        
+        ``metrics`` carries the date's DAU, eligible users and retention rate,
+        which are also set on the rows.
+        """
+        segment_codes, install_days = self._user_arrays(users_df)
+        eligible_counts = self._eligible_user_counts(install_days, dates)
+        
+        for current_date, eligible_users in zip(dates, eligible_counts):
+            active, session_data = self._simulate_day(segment_codes, install_days, current_date)
+            metrics = {
+                'date': current_date.strftime('%Y-%m-%d'),
+                'daily_active_users': len(active),
+                'eligible_users': eligible_users,
+                'retention_rate': self._retention_rates([len(active)], [eligible_users])[0]
+            }
+            day_df = self._aggregate_day(users_df, active, session_data, metrics['date']).assign(
+                daily_active_users=metrics['daily_active_users'],
+                retention_rate=metrics['retention_rate']
+            )
+            yield metrics, active, day_df
+    
+    def generate_sharded_dataset(self, num_users=50000, days=90, num_shards=32, workers=None, state_dir=None):
+        """Generate the complete dataset by simulating user shards in a process pool
+        
+        Every shard gets its own random stream spawned from the master seed,
+        so the output depends only on ``seed`` and ``num_shards`` and is
+        identical for any ``workers`` count.
+        """
+        print(f"Generating dataset for {num_users:,} users over {days} days in {num_shards} shards...")
+        
+        print("1. Generating user base...")
+        users_df = self.generate_users(num_users)
+        
+        # Generate date range (last N days)
+        end = datetime.strptime(datetime.now().strftime('%Y-%m-%d'), '%Y-%m-%d')
+        dates = pd.date_range(end - timedelta(days=days), end)
+        
+        print("2. Simulating shards...")
+        seeds = np.random.SeedSequence(self.seed).spawn(num_shards)
+        shards = [
+            (self.seed, seed_sequence, users_df.iloc[positions], dates)
+            for seed_sequence, positions in zip(seeds, np.array_split(np.arange(num_users), num_shards))
+        ]
+        if workers == 1:
+            results = [_generate_shard(shard) for shard in shards]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_generate_shard, shards))
+        
+        # Shards hold disjoint users, so per-date active counts simply add up
+        print("3. Merging shards...")
+        daily_active_users = np.sum([active_counts for _, active_counts in results], axis=0)
+        _, install_days = self._user_arrays(users_df)
+        eligible_users = self._eligible_user_counts(install_days, dates)
+        daily_metrics = pd.DataFrame({
+            'date': dates.strftime('%Y-%m-%d'),
+            'daily_active_users': daily_active_users,
+            'retention_rate': self._retention_rates(daily_active_users, eligible_users)
+        })
+        
+        final_dataset = compact_mobile_analytics(
+            pd.concat([shard_df for shard_df, _ in results], ignore_index=True)
+            .merge(daily_metrics, on='date')
+            .sort_values(['user_id', 'date'], ignore_index=True)
+        )
+        
+        if state_dir:
+            self._save_dataset_state(state_dir, users_df, final_dataset, dates[-1])
+        
+        print(f"✅ Dataset generated: {len(final_dataset):,} records")
+        print(f"👥 Unique users: {final_dataset['user_id'].nunique():,}")
+        return final_dataset
+    
+    def _simulate_shard(self, users_df, dates):
+        """Simulate every date for one shard of users
+        
+        Returns the shard's per-user daily rows (without DAU/retention) and
+        its active-user count per date.
+        """
+        segment_codes, install_days = self._user_arrays(users_df)
+        days, active_counts = [], []
+        for current_date in dates:
+            active, session_data = self._simulate_day(segment_codes, install_days, current_date)
+            days.append(self._aggregate_day(users_df, active, session_data, current_date.strftime('%Y-%m-%d')))
+            active_counts.append(len(active))
+        
+        shard_df = self._add_realistic_variations(pd.concat(days, ignore_index=True))
+        return shard_df, np.array(active_counts)
+    
+    def _aggregate_day(self, users_df, active, session_data, date_str):
+        """Build one day's per-user rows from session arrays (DAU/retention added by the caller)"""
+        owner = session_data['owner']
+        num_active = len(active)
+        
+        def per_user(column):
+            return np.bincount(owner, weights=session_data[column], minlength=num_active)
+        
+        return pd.DataFrame({
+            'user_id': users_df['user_id'].to_numpy()[active],
+            'date': date_str,
+            'session_duration': per_user('session_duration'),
+            'screens_viewed': per_user('screens_viewed').astype(np.int64),
+            'app_opens': per_user('app_opens').astype(np.int64),
+            'device_type': users_df['device_type'].to_numpy()[active],
+            'user_acquisition_channel': users_df['acquisition_channel'].to_numpy()[active],
+            'user_segment': users_df['segment'].to_numpy()[active]
+        })
+    
     def _add_realistic_variations(self, df):
         """Add realistic data variations and edge cases"""
         # Add some missing data (realistic scenario)
-        missing_indices = np.random.choice(
+        missing_indices = self.rng.choice(
             df.index, 
             size=int(len(df) * 0.02),  # 2% missing data
             replace=False
@@ -280,20 +584,41 @@ class MobileAnalyticsGenerator:
         
         # Add some outliers (power users with extreme usage)
         power_user_indices = df[df['user_segment'] == 'power_users'].index
-        outlier_indices = np.random.choice(
+        outlier_indices = self.rng.choice(
             power_user_indices,
             size=int(len(power_user_indices) * 0.05),
             replace=False
         )
         
         # Extreme session durations for outliers
-        df.loc[outlier_indices, 'session_duration'] *= np.random.uniform(2, 5, size=len(outlier_indices))
-        df.loc[outlier_indices, 'screens_viewed'] *= np.random.randint(2, 4, size=len(outlier_indices))
+        df.loc[outlier_indices, 'session_duration'] *= self.rng.uniform(2, 5, size=len(outlier_indices))
+        df.loc[outlier_indices, 'screens_viewed'] *= self.rng.integers(2, 4, size=len(outlier_indices))
         
         return df
 
+def _generate_shard(shard):
+    """Process-pool entry point: simulate one shard with its own random stream"""
+    seed, seed_sequence, users_df, dates = shard
+    generator = MobileAnalyticsGenerator(seed=seed)
+    generator.rng = np.random.default_rng(seed_sequence)
+    return generator._simulate_shard(users_df, dates)
+
 # Usage Example
 def main():
+    parser = argparse.ArgumentParser(description="Generate the mobile analytics dataset")
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--stream-dir', help="Stream date-partitioned Parquet files here instead of one CSV")
+    parser.add_argument('--block-days', type=int, default=7, help="Days generated per block when streaming")
+    parser.add_argument('--workers', type=int, help="Generate in a process pool with this many workers")
+    parser.add_argument('--shards', type=int, default=32, help="User shards when generating with --workers")
+    parser.add_argument('--state-dir', help="Save generator state here (streamed datasets keep it in --stream-dir)")
+    parser.add_argument('--append-days', type=int,
+                        help="Append this many days to the existing dataset from the saved state")
+    args = parser.parse_args()
+    if args.append_days and not (args.state_dir or args.stream_dir):
+        parser.error("--append-days needs the saved state: pass --state-dir (or --stream-dir)")
+    
     # Initialize generator
     generator = MobileAnalyticsGenerator(seed=42)
     
@@ -301,14 +626,34 @@ def main():
     # Small dataset for testing: 1,000 users, 30 days
     # Medium dataset: 10,000 users, 60 days  
     # Large dataset: 50,000 users, 90 days
+    # 1M users / 365 days: use --stream-dir so memory stays bounded
     
-    dataset = generator.generate_complete_dataset(
-        num_users=10000,  # Adjust based on your needs
-        days=60
-    )
+    filename = "mobile_analytics.csv"
+    
+    if args.append_days:
+        return generator.append_days(
+            args.stream_dir or filename, args.state_dir or args.stream_dir,
+            days=args.append_days, block_days=args.block_days
+        )
+    
+    if args.stream_dir:
+        return generator.generate_streaming_dataset(
+            args.stream_dir, num_users=args.users, days=args.days, block_days=args.block_days
+        )
+    
+    if args.workers:
+        dataset = generator.generate_sharded_dataset(
+            num_users=args.users, days=args.days, num_shards=args.shards, workers=args.workers,
+            state_dir=args.state_dir
+        )
+    else:
+        dataset = generator.generate_complete_dataset(
+            num_users=args.users,
+            days=args.days,
+            state_dir=args.state_dir
+        )
     
     # Save to CSV
-    filename = "mobile_analytics.csv"
     dataset.to_csv(filename, index=False)
     print(f"\n💾 Dataset saved as '{filename}'")
     
@@ -0,0 +1,119 @@
+# Benchmark: row-by-row vs vectorized activity generation
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from dataset import MobileAnalyticsGenerator
+
+
+def legacy_daily_activities(generator, users_df, start_date, end_date):
+    """Original iterrows-based activity loop, kept here as the reference"""
+    activities = []
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+
+    for current_date in pd.date_range(start, end):
+        date_str = current_date.strftime('%Y-%m-%d')
+        weekend_multiplier = 1.3 if current_date.weekday() >= 5 else 1.0
+
+        for _, user in users_df.iterrows():
+            segment = user['segment']
+            activity_probs = {
+                'power_users': 0.85 * weekend_multiplier,
+                'regular_users': 0.45 * weekend_multiplier,
+                'casual_users': 0.15 * weekend_multiplier,
+                'churned_users': 0.02
+            }
+            install_date = pd.to_datetime(user['install_date'])
+            if current_date < install_date:
+                continue
+            days_since_install = (current_date - install_date).days
+            retention_decay = max(0.1, 1 - (days_since_install * 0.002))
+
+            if random.random() < activity_probs[segment] * retention_decay:
+                num_sessions = min({
+                    'power_users': np.random.poisson(4) + 1,
+                    'regular_users': np.random.poisson(2) + 1,
+                    'casual_users': np.random.poisson(1) + 1,
+                    'churned_users': 1
+                }[segment], 8)
+                min_dur, max_dur = generator.duration_ranges[segment]
+                for session in range(num_sessions):
+                    session_duration = np.random.uniform(min_dur, max_dur)
+                    activities.append({
+                        'user_id': user['user_id'],
+                        'date': date_str,
+                        'session_duration': round(session_duration, 2),
+                        'screens_viewed': max(1, int(session_duration / 2) + np.random.poisson(1)),
+                        'app_opens': 1 if session == 0 else 0,
+                        'device_type': user['device_type'],
+                        'user_acquisition_channel': user['acquisition_channel'],
+                        'user_segment': segment
+                    })
+
+    return pd.DataFrame(activities)
+
+
+def segment_profile(activities_df, users_df, num_days):
+    """Active-day rate and sessions per active day by segment"""
+    user_days = activities_df.groupby(['user_segment', 'user_id', 'date']).size()
+    by_segment = user_days.groupby('user_segment')
+    eligible = users_df['segment'].value_counts() * num_days
+    return pd.DataFrame({
+        'active_rate': by_segment.size() / eligible,
+        'sessions_per_day': by_segment.mean()
+    }).round(3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the activity engine")
+    parser.add_argument('--users', type=int, nargs='+', default=[10000, 50000, 500000])
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--legacy-max-users', type=int, default=50000,
+                        help='Above this size the legacy time is extrapolated from the largest measured run')
+    args = parser.parse_args()
+
+    end_date = datetime.now().strftime('%Y-%m-%d')
+    start_date = (datetime.now() - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+    legacy_rate = None
+
+    print(f"⏱️  Activity generation over {args.days} days\n")
+    print(f"{'users':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+
+    for num_users in args.users:
+        generator = MobileAnalyticsGenerator(seed=42)
+        users_df = generator.generate_users(num_users)
+
+        t0 = time.perf_counter()
+        activities = generator.generate_daily_activities(users_df, start_date, end_date)
+        vectorized = time.perf_counter() - t0
+
+        if num_users <= args.legacy_max_users:
+            t0 = time.perf_counter()
+            legacy = legacy_daily_activities(generator, users_df, start_date, end_date)
+            legacy_time = time.perf_counter() - t0
+            legacy_rate = legacy_time / num_users
+            label = f"{legacy_time:12.2f}"
+        else:
+            legacy, legacy_time = None, legacy_rate * num_users if legacy_rate else float('nan')
+            label = f"{'~' + format(legacy_time, '.0f'):>12}"
+
+        print(f"{num_users:>10,} {label} {vectorized:15.3f} {legacy_time / vectorized:8.0f}x")
+
+        if legacy is not None and num_users == args.users[0]:
+            print("\n📊 Segment profile (legacy vs vectorized):")
+            profile = segment_profile(legacy, users_df, args.days).join(
+                segment_profile(activities, users_df, args.days), rsuffix='_vectorized')
+            print(profile.to_string())
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Benchmark: pickled sklearn forest vs flattened compiled forest
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+warnings.filterwarnings("ignore")
+
+import churn_model
+from compiled_forest import CompiledForest
+from datasets import read_dataset
+
+
+def best_of(fn, repeat=200):
+    """Fastest wall time of `repeat` calls, in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000
+
+
+if __name__ == "__main__":
+    data_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "data", "mobile_analytics.csv")
+    features, _ = churn_model.preprocess_new_data(read_dataset("mobile_analytics", data_path))
+
+    model = churn_model.get_model()
+    forest = churn_model.get_compiled_forest()
+
+    print("🔍 Bit-identity on", f"{len(features):,} users")
+    frame = pd.DataFrame(features, columns=model.feature_names_in_)
+    expected = model.predict_proba(frame)
+    actual = forest.predict_proba(features)
+    print(f"  identical probabilities: {np.array_equal(expected, actual)}")
+    print(f"  identical labels:        {np.array_equal(model.predict(frame), forest.predict(features))}")
+
+    print("\n⏱️  Single-user latency (best of 200)")
+    one_df = frame.iloc[[0]]
+    one = features[:1]
+    print(f"  sklearn predict_proba:   {best_of(lambda: model.predict_proba(one_df)):8.3f} ms")
+    print(f"  compiled predict_proba:  {best_of(lambda: forest.predict_proba(one)):8.3f} ms")
+
+    print("\n⏱️  Bulk scoring, all users (best of 3)")
+    model.n_jobs = 1  # one core each
+    print(f"  sklearn predict_proba:   {best_of(lambda: model.predict_proba(frame), 3):8.1f} ms")
+    print(f"  compiled predict_proba:  {best_of(lambda: forest.predict_proba(features), 3):8.1f} ms")
+
+    print("\n⏱️  Artifact load (best of 20)")
+    import joblib
+    print(f"  joblib.load(pkl):        {best_of(lambda: joblib.load(churn_model.MODEL_PATH), 20):8.3f} ms")
+    print(f"  CompiledForest.load:     {best_of(lambda: CompiledForest.load(churn_model.COMPILED_FOREST_PATH), 20):8.3f} ms")
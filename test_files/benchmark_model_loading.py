@@ -0,0 +1,48 @@
+# Benchmark: cold-start time and RSS of importing churn_model vs loading the model
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time, warnings
+warnings.filterwarnings("ignore")
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS"):
+                return int(line.split()[1]) / 1024
+
+t0 = time.perf_counter()
+import churn_model
+import_s = time.perf_counter() - t0
+import_rss = rss_mb()
+
+t0 = time.perf_counter()
+churn_model.get_model()
+load_s = time.perf_counter() - t0
+
+print(json.dumps({"import_s": import_s, "import_rss": import_rss,
+                  "load_s": load_s, "loaded_rss": rss_mb()}))
+"""
+
+
+def run_probe(runs=5):
+    """Run the probe in fresh interpreters and keep the fastest run"""
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(results, key=lambda r: r["import_s"] + r["load_s"])
+
+
+if __name__ == "__main__":
+    r = run_probe()
+    print("⏱️  churn_model cold start (best of 5 fresh processes)\n")
+    print(f"  import churn_model:        {r['import_s'] * 1000:8.1f} ms   RSS {r['import_rss']:7.1f} MB")
+    print(f"  + first get_model():       {r['load_s'] * 1000:8.1f} ms   RSS {r['loaded_rss']:7.1f} MB")
+    print(f"\n  Saved per process that never scores: "
+          f"{r['load_s'] * 1000:.0f} ms and {r['loaded_rss'] - r['import_rss']:.0f} MB RSS")
@@ -0,0 +1,50 @@
+# Benchmark: re-reading the risk score CSV vs the indexed risk store
+import os
+import sys
+import time
+import tempfile
+import warnings
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+warnings.filterwarnings("ignore")
+
+from risk_store import RiskScoreStore
+from datasets import read_dataset
+
+
+def best_of(fn, repeat=20):
+    """Fastest wall time of `repeat` calls, in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RiskScoreStore(os.path.join(tmp, "risk_scores.sqlite"))
+        scores = store.rescore(read_dataset("mobile_analytics"))
+        csv_path = os.path.join(tmp, "all_user_risk_scores.csv")
+        scores.to_csv(csv_path, index=False)
+        user_id = scores["user_id"].iloc[len(scores) // 2]
+
+        def csv_top_k():
+            df = pd.read_csv(csv_path)
+            return df[df["user_segment"] == "power_users"].nlargest(500, "churn_probability")
+
+        def csv_lookup():
+            df = pd.read_csv(csv_path)
+            return df[df["user_id"] == user_id]
+
+        print(f"⏱️  {len(store):,} users (best of 20)\n")
+        print(f"  top 500 in segment, CSV:   {best_of(csv_top_k):8.3f} ms")
+        print(f"  top 500 in segment, store: {best_of(lambda: store.top_k(500, user_segment='power_users')):8.3f} ms")
+        print(f"  point lookup, CSV:         {best_of(csv_lookup):8.3f} ms")
+        print(f"  point lookup, store:       {best_of(lambda: store.get(user_id)):8.3f} ms")
+        print(f"  rescore upsert (all):      {best_of(lambda: store.upsert(scores), 5):8.3f} ms")
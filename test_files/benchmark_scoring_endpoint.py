@@ -0,0 +1,64 @@
+# Benchmark: /api/churn/score under concurrent per-user requests
+import os
+import sys
+import json
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+warnings.filterwarnings("ignore")
+
+from flask import Flask
+
+import churn_model
+import scoring_service
+from datasets import read_dataset
+
+
+def user_payloads(raw, n_users):
+    payloads = {}
+    for user_id, rows in raw.groupby("user_id", observed=True):
+        rows = rows.assign(date=rows["date"].dt.strftime("%Y-%m-%d"))
+        payloads[str(user_id)] = json.loads(rows.to_json(orient="records"))
+        if len(payloads) == n_users:
+            break
+    return payloads
+
+
+def run(server, payloads, clients):
+    def call(user_id):
+        with server.test_client() as client:
+            return user_id, client.post("/api/churn/score", json={"rows": payloads[user_id]}).get_json()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        responses = dict(pool.map(call, payloads))
+    return responses, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    raw = read_dataset("mobile_analytics")
+    payloads = user_payloads(raw, n_users)
+
+    expected = churn_model.predict_churn(raw[raw["user_id"].isin(list(payloads))])
+    expected = dict(zip(expected["user_id"].astype(str), expected["churn_probability"]))
+
+    server = scoring_service.register_scoring_routes(Flask(__name__))
+    print(f"⏱️  {n_users} single-user requests\n")
+    configs = [(0, 1, 1), (0, 1, 16), (scoring_service.BATCH_WINDOW_MS, scoring_service.MAX_BATCH_REQUESTS, 16)]
+    for window_ms, max_batch, clients in configs:
+        scoring_service.batcher = scoring_service.MicroBatcher(window_ms=window_ms, max_batch=max_batch)
+        scoring_service.latency = scoring_service.LatencyTracker()
+        responses, elapsed = run(server, payloads, clients)
+
+        mismatches = sum(
+            r["predictions"][0]["churn_probability"] != expected[user_id] for user_id, r in responses.items()
+        )
+        stats = {**scoring_service.latency.summary(), **scoring_service.batcher.summary()}
+        print(f"  window {window_ms} ms, max batch {max_batch:3d}, {clients:2d} clients: {n_users / elapsed:7.1f} req/s  "
+              f"p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms  "
+              f"{stats['avg_requests_per_batch']:5.1f} req/batch  mismatches {mismatches}")
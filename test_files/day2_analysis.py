@@ -4,8 +4,12 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
 import glob
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from datasets import read_dataset
+
 class MobileAnalyticsFoundation:
     def __init__(self):
         self.dau_primary_df = None
@@ -54,7 +58,7 @@ class MobileAnalyticsFoundation:
                 
             # Load Raw mobile data
             if os.path.exists('mobile_analytics.csv'):
-                self.mobile_raw_df = pd.read_csv('mobile_analytics.csv')
+                self.mobile_raw_df = read_dataset('mobile_analytics', 'mobile_analytics.csv')
                 print(f"✅ Raw Mobile data loaded: {self.mobile_raw_df.shape}")
                 print(f"   Columns: {list(self.mobile_raw_df.columns)}")
             else:
@@ -133,7 +137,7 @@ class MobileAnalyticsFoundation:
             print(self.mobile_raw_df[numeric_cols].describe())
         
         # Categorical analysis
-        categorical_cols = self.mobile_raw_df.select_dtypes(include=['object']).columns
+        categorical_cols = self.mobile_raw_df.select_dtypes(include=['object', 'category']).columns
         categorical_cols = [col for col in categorical_cols if col not in date_columns]
         
         if len(categorical_cols) > 0:
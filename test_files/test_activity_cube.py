@@ -0,0 +1,60 @@
+# Checks: activity cube roll-ups against direct aggregation of the rows
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from activity_cube import ActivityCube
+
+
+def make_rows(n=20_000, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "user_id": pd.Categorical([f"user_{i:05d}" for i in rng.integers(0, 2_000, n)]),
+        "date": pd.Timestamp("2026-09-01") + pd.to_timedelta(rng.integers(0, 30, n), unit="D"),
+        "session_duration": rng.gamma(2.0, 20.0, n).astype("float32"),
+        "screens_viewed": rng.integers(1, 40, n).astype("int32"),
+        "app_opens": rng.integers(1, 5, n).astype("int16"),
+        "device_type": pd.Categorical(rng.choice(["Android", "iOS"], n)),
+        "user_acquisition_channel": pd.Categorical(rng.choice(["organic", "email", "referral"], n)),
+        "user_segment": pd.Categorical(rng.choice(["casual_users", "power_users"], n)),
+    })
+
+
+def test_rollup_matches_rows():
+    rows = make_rows()
+    total = ActivityCube.from_frame(rows).rollup().iloc[0]
+    assert total["sessions"] == len(rows)
+    assert np.isclose(total["duration_sum"], rows["session_duration"].astype("float64").sum())
+    assert abs(total["active_users"] / rows["user_id"].nunique() - 1) < 0.1
+
+
+def test_missing_dimensions_are_left_out():
+    rows = make_rows()
+    rows.loc[rows.index[:3_000], "user_acquisition_channel"] = np.nan
+    rows.loc[rows.index[3_000:3_100], "date"] = pd.NaT
+    rows.loc[rows.index[3_100:3_200], "user_id"] = np.nan
+
+    cube = ActivityCube.from_frame(rows)
+    complete = rows.iloc[3_100:]  # groupby drops rows with a missing dimension
+    total = cube.rollup().iloc[0]
+    assert total["sessions"] == len(complete)
+    assert abs(total["active_users"] / rows.iloc[3_200:]["user_id"].nunique() - 1) < 0.1
+    assert len(cube.registers) == len(cube.cells)
+
+
+def test_chunked_build_merges_exactly():
+    rows = make_rows()
+    whole = ActivityCube.from_frame(rows)
+    chunked = ActivityCube.from_chunks([rows.iloc[:8_000], rows.iloc[8_000:]])
+    assert (whole.registers == chunked.registers).all()
+    assert np.allclose(whole.cells["sessions"], chunked.cells["sessions"])
+
+
+if __name__ == "__main__":
+    test_rollup_matches_rows()
+    test_missing_dimensions_are_left_out()
+    test_chunked_build_merges_exactly()
+    print("✅ Activity cube checks passed")
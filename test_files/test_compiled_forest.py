@@ -0,0 +1,63 @@
+# Checks: compiled forest against the sklearn forest it was flattened from
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import compiled_forest
+from compiled_forest import CompiledForest
+
+
+def make_forest(n=3_000, seed=3):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 8)).astype("float32"), columns=[f"f{i}" for i in range(8)])
+    signal = X["f0"].fillna(0) + X["f1"].fillna(0) * X["f2"].fillna(0).clip(lower=0)
+    X = X.mask(rng.random(X.shape) < 0.05)  # missing values, so splits learn a NaN direction
+    y = (signal + rng.normal(0, 0.5, n) > 0).astype(int)
+    # leaf size rather than max_depth, so trees end at different depths
+    model = RandomForestClassifier(n_estimators=25, min_samples_leaf=20, random_state=seed).fit(X, y)
+    return model, X
+
+
+def test_probabilities_are_bit_identical():
+    model, X = make_forest()
+    forest = CompiledForest.from_sklearn(model)
+    # both walks: wide up to WIDE_WALK_ROWS, tree by tree above
+    for n in (1, compiled_forest.WIDE_WALK_ROWS, compiled_forest.WIDE_WALK_ROWS + 1, len(X)):
+        assert np.array_equal(forest.predict_proba(X.to_numpy()[:n]), model.predict_proba(X.iloc[:n]))
+    assert np.array_equal(forest.predict(X.to_numpy()), model.predict(X))
+    assert forest.predict_proba(X.to_numpy()[:0]).shape == (0, 2)
+
+
+def test_blocks_and_leaves_match():
+    model, X = make_forest()
+    forest = CompiledForest.from_sklearn(model)
+    block_rows = compiled_forest.BLOCK_ROWS
+    compiled_forest.BLOCK_ROWS = 1_000  # several blocks, the last one partial
+    try:
+        assert np.array_equal(forest.predict_proba(X.to_numpy()), model.predict_proba(X))
+        assert np.array_equal(forest.apply(X.to_numpy()) - forest.roots, model.apply(X))
+    finally:
+        compiled_forest.BLOCK_ROWS = block_rows
+
+
+def test_saved_artifact_matches():
+    model, X = make_forest()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "forest")
+        CompiledForest.from_sklearn(model, source_sha256="abc").save(path)
+        mapped = CompiledForest.load(path)
+        CompiledForest.from_sklearn(model, source_sha256="def").save(path)  # swapped under the mapping
+        assert mapped.source_sha256 == "abc" and CompiledForest.load(path).source_sha256 == "def"
+        assert np.array_equal(mapped.predict_proba(X.to_numpy()), model.predict_proba(X))
+
+
+if __name__ == "__main__":
+    test_probabilities_are_bit_identical()
+    test_blocks_and_leaves_match()
+    test_saved_artifact_matches()
+    print("✅ Compiled forest checks passed")
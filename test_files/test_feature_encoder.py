@@ -0,0 +1,63 @@
+# Checks: feature encoder against get_dummies(drop_first=True) encoding
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics_schema import CATEGORY_LEVELS, compact_mobile_analytics
+from churn_model import FEATURE_ENCODER_PATH, aggregate_user_features
+from feature_encoder import ENCODED_DIMENSIONS, FeatureEncoder
+
+
+def make_rows(n=20_000, seed=11):
+    rng = np.random.default_rng(seed)
+    return compact_mobile_analytics(pd.DataFrame({
+        "user_id": [f"user_{i:05d}" for i in rng.integers(0, 3_000, n)],
+        "date": pd.Timestamp("2026-09-01") + pd.to_timedelta(rng.integers(0, 30, n), unit="D"),
+        "session_duration": rng.gamma(2.0, 20.0, n),
+        "screens_viewed": rng.integers(1, 40, n),
+        "app_opens": rng.integers(1, 5, n),
+        "retention_rate": rng.uniform(0, 100, n),
+        "daily_active_users": rng.integers(500, 5_000, n),
+        **{dim: rng.choice(levels, n) for dim, levels in CATEGORY_LEVELS.items()},
+    }))
+
+
+def reference_features(agg_df, feature_names):
+    """One-hot columns named <dimension>_<level>, baseline dropped, in model order"""
+    frame = agg_df.rename(columns={f"{dim}_last": dim for dim in ENCODED_DIMENSIONS})
+    dummies = pd.get_dummies(frame, columns=ENCODED_DIMENSIONS, drop_first=True)
+    return dummies.reindex(columns=feature_names, fill_value=0).to_numpy(dtype=np.float32)
+
+
+def test_matches_get_dummies():
+    encoder = FeatureEncoder.load(FEATURE_ENCODER_PATH)
+    agg_df = aggregate_user_features(make_rows())
+    expected = reference_features(agg_df, encoder.feature_names)
+    assert np.array_equal(encoder.transform(agg_df), expected, equal_nan=True)
+
+
+def test_fit_recovers_saved_encoder():
+    saved = FeatureEncoder.load(FEATURE_ENCODER_PATH)
+    fitted = FeatureEncoder.fit(saved.feature_names)
+    assert fitted.numeric_columns == saved.numeric_columns
+    assert fitted.level_columns == saved.level_columns
+
+
+def test_unseen_and_missing_levels_encode_as_zeros():
+    encoder = FeatureEncoder.load(FEATURE_ENCODER_PATH)
+    agg_df = aggregate_user_features(make_rows(2_000)).head(3)
+    agg_df["user_acquisition_channel_last"] = ["tiktok", None, "email"]  # unseen, missing, known
+    X = encoder.transform(agg_df)
+    channel = list(encoder.level_columns["user_acquisition_channel"].values())
+    assert not X[:2, channel].any()
+    assert X[2, encoder.level_columns["user_acquisition_channel"]["email"]] == 1.0
+
+
+if __name__ == "__main__":
+    test_matches_get_dummies()
+    test_fit_recovers_saved_encoder()
+    test_unseen_and_missing_levels_encode_as_zeros()
+    print("✅ Feature encoder checks passed")